@@ -381,11 +381,6 @@ async def recovery_status():
     Check recovery status - which tables are loaded and their record counts
     """
     try:
-        from src.recovery.recovery import ETLRecovery
-        
-        recovery = ETLRecovery()
-        loaded_tables = recovery.get_loaded_tables()
-        
         # Get detailed status from database
         if settings.DATA_STORE == 'snowflake':
             from src.loaders.data_sources import SnowflakeDataSource
@@ -395,35 +390,15 @@ async def recovery_status():
             data_source = SQLiteDataSource(settings.SQLITE_CONNECTION_URL)
         
         data_source.connect()
-        cursor = data_source.cursor
-        
-        tables_info = []
         
-        if settings.DATA_STORE == 'snowflake':
-            cursor.execute("SHOW TABLES")
-            tables = cursor.fetchall()
-            
-            for table in tables:
-                table_name = table[1]
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                count = cursor.fetchone()[0]
-                tables_info.append({
-                    "table": table_name,
-                    "records": count,
-                    "status": "loaded" if count > 0 else "empty"
-                })
-        else:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
-            
-            for (table_name,) in tables:
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                count = cursor.fetchone()[0]
-                tables_info.append({
-                    "table": table_name,
-                    "records": count,
-                    "status": "loaded" if count > 0 else "empty"
-                })
+        tables_info = [
+            {
+                "table": table_name,
+                "records": count,
+                "status": "loaded" if count > 0 else "empty"
+            }
+            for table_name, count in data_source.get_table_row_counts().items()
+        ]
         
         data_source.disconnect()
         
@@ -555,33 +530,11 @@ async def check_empty_tables():
         empty_tables = []
         tables_with_data = []
         
-        cursor = data_source.cursor
-        
-        if settings.DATA_STORE == 'snowflake':
-            cursor.execute("SHOW TABLES")
-            tables = cursor.fetchall()
-            
-            for table in tables:
-                table_name = table[1]
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                count = cursor.fetchone()[0]
-                
-                if count == 0:
-                    empty_tables.append(table_name)
-                else:
-                    tables_with_data.append({"table": table_name, "records": count})
-        else:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
-            
-            for (table_name,) in tables:
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                count = cursor.fetchone()[0]
-                
-                if count == 0:
-                    empty_tables.append(table_name)
-                else:
-                    tables_with_data.append({"table": table_name, "records": count})
+        for table_name, count in data_source.get_table_row_counts().items():
+            if count == 0:
+                empty_tables.append(table_name)
+            else:
+                tables_with_data.append({"table": table_name, "records": count})
         
         data_source.disconnect()
         
@@ -62,6 +62,7 @@ class Settings:
     # Snowflake Settings
     SNOWFLAKE_COPY_THRESHOLD: int = int(os.getenv('SNOWFLAKE_COPY_THRESHOLD', '10000'))
     LOAD_STRATEGY: str = os.getenv('LOAD_STRATEGY', 'bulk')
+    COUNT_POOL_SIZE: Optional[int] = int(os.getenv('COUNT_POOL_SIZE')) if os.getenv('COUNT_POOL_SIZE') else None  # Connections for parallel COUNT(*) fallback
     
     # Notification Settings
     ENABLE_NOTIFICATIONS: bool = os.getenv('ENABLE_NOTIFICATIONS', 'false').lower() == 'true'
@@ -16,7 +16,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from transformers.transformation_mapping import ALL_MAPPINGS
+from transformers.transformation_mapping import ALL_MAPPINGS, JOIN_PATTERNS
 
 
 def get_required_source_tables():
@@ -35,9 +35,42 @@ def get_required_source_tables():
     return required_tables
 
 
+def get_required_source_columns():
+    """
+    Extract the columns each source table must supply from transformation mappings.
+    
+    Includes qualified ("table.column") mappings, unqualified mappings for every
+    source table of their target (any of them may be the main table), and the
+    keys that join related tables.
+    
+    Returns:
+        Dict mapping source table name to set of column names
+    """
+    required_columns = {}
+    
+    for target_table, config in ALL_MAPPINGS.items():
+        source_tables = config.get('source_tables', [])
+        for source_field in config.get('column_mappings', {}).values():
+            if '.' in source_field:
+                table_name, column_name = source_field.split('.', 1)
+                required_columns.setdefault(table_name, set()).add(column_name)
+            else:
+                for table_name in source_tables:
+                    required_columns.setdefault(table_name, set()).add(source_field)
+    
+    for table_pair, join_key in JOIN_PATTERNS.items():
+        for table_name in table_pair:
+            required_columns.setdefault(table_name, set()).add(join_key)
+    
+    return required_columns
+
+
 # Required source tables (extracted from transformation_mapping.py)
 REQUIRED_TABLES = get_required_source_tables()
 
+# Columns transformations read from each required table
+REQUIRED_COLUMNS = get_required_source_columns()
+
 
 # Semi-static tables: Required but rarely updated (only created_at_epoch, no updated_at_epoch)
 # Extract based on mode: if mode='skip', these can be skipped
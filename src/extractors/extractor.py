@@ -19,8 +19,13 @@ import pymysql.cursors
 import logging
 import gc
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .base import BaseExtractor
-from .extraction_mapping import should_extract_table
+from .extraction_mapping import REQUIRED_COLUMNS, should_extract_table
 from ..utils.memory_monitor import MemoryMonitor, estimate_table_memory
 
 class DataExtractor(BaseExtractor):
@@ -469,6 +474,26 @@ class DataExtractor(BaseExtractor):
                     pass
             # Don't close connection - keep in pool
     
+    def _get_select_columns(self, database: str, table_name: str) -> str:
+        """
+        Build the SELECT column list for a table: only the columns transformations read
+        
+        Falls back to * for tables without mapped columns or whose columns cannot be fetched.
+        
+        Returns:
+            Comma-separated quoted column names in table order, or "*"
+        """
+        required_columns = REQUIRED_COLUMNS.get(table_name)
+        if not required_columns:
+            return '*'
+        
+        table_columns = self._get_all_table_columns(database).get(table_name)
+        columns = [column for column in table_columns or () if column in required_columns]
+        if not columns:
+            return '*'
+        
+        return ', '.join(f"`{column}`" for column in columns)
+    
     def _has_date_column(self, database: str, table_name: str) -> tuple:
         """
         Check if table has a date column for filtering and return the column name
@@ -721,20 +746,21 @@ class DataExtractor(BaseExtractor):
             
             # Check if table has date column for filtering
             has_date_column, date_column = self._has_date_column(database, table_name)
+            columns = self._get_select_columns(database, table_name)
             
             # Get date filter params to check if filtering is actually enabled
             start_date, end_date = self._get_date_filter_params()
             
             if has_date_column and (start_date or end_date):
                 # Use date filtering
-                base_query = f"SELECT * FROM {table_name} LIMIT %s OFFSET %s"
+                base_query = f"SELECT {columns} FROM {table_name} LIMIT %s OFFSET %s"
                 query, params = self._build_date_filter_query(table_name, base_query, date_column)
                 # Add LIMIT and OFFSET parameters
                 params.extend([self.config['extraction']['batch_size'], offset])
                 cursor.execute(query, params)
             else:
                 # No date filtering - extract all data
-                query = f"SELECT * FROM {table_name} LIMIT %s OFFSET %s"
+                query = f"SELECT {columns} FROM {table_name} LIMIT %s OFFSET %s"
                 cursor.execute(query, (self.config['extraction']['batch_size'], offset))
             
             # Fetch all results - PyMySQL handles None values properly
@@ -1054,8 +1080,8 @@ class DataExtractor(BaseExtractor):
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
         # Write without indentation for faster I/O (compact JSON)
-        with open(filepath, 'w') as f:
-            json.dump(consolidated_data, f, default=str, separators=(',', ':'))
+        self._write_compact_json(filepath, consolidated_data)
+        self._write_metadata_sidecar(filepath, consolidated_data)
         
         self.logger.info(f"Saved to: {filepath}")
         return filepath
@@ -1234,12 +1260,13 @@ class DataExtractor(BaseExtractor):
             # Check if table has date filtering
             has_date_col, date_col = self._check_date_column(database, table_name)
             start_date, end_date = self._get_date_filter_params()
+            columns = self._get_select_columns(database, table_name)
             
             # Build query
             if has_date_col and (start_date or end_date):
                 query = self._build_date_filter_query(
                     table_name, 
-                    f"SELECT * FROM {table_name} LIMIT %s OFFSET %s",
+                    f"SELECT {columns} FROM {table_name} LIMIT %s OFFSET %s",
                     date_col,
                     start_date,
                     end_date
@@ -1247,7 +1274,7 @@ class DataExtractor(BaseExtractor):
                 params = query[1] + [self.config['extraction']['batch_size'], offset]
                 query = query[0]
             else:
-                query = f"SELECT * FROM {table_name} LIMIT %s OFFSET %s"
+                query = f"SELECT {columns} FROM {table_name} LIMIT %s OFFSET %s"
                 params = [self.config['extraction']['batch_size'], offset]
             
             cursor.execute(query, params)
@@ -1370,11 +1397,56 @@ class DataExtractor(BaseExtractor):
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
         # Write compact JSON
-        with open(filepath, 'w') as f:
-            json.dump(consolidated_data, f, default=str, separators=(',', ':'))
+        self._write_compact_json(filepath, consolidated_data)
+        self._write_metadata_sidecar(filepath, consolidated_data)
         
         return filepath
     
+    @staticmethod
+    def _write_compact_json(filepath: str, data: Dict):
+        """
+        Write extracted data as compact JSON
+        
+        orjson encodes in one C call; datetimes are passed through to str() like every
+        other non-JSON MySQL value (Decimal, bytes, timedelta), so the output text matches
+        json.dump with default=str.
+        
+        Args:
+            filepath: Path of the JSON file to write
+            data: Extracted data to serialize
+        """
+        if orjson is None:
+            with open(filepath, 'w') as f:
+                json.dump(data, f, default=str, separators=(',', ':'))
+            return
+        
+        payload = orjson.dumps(
+            data, default=str, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
+        with open(filepath, 'wb') as f:
+            f.write(payload)
+    
+    def _write_metadata_sidecar(self, filepath: str, consolidated_data: Dict):
+        """Write per-table record counts to <file>.meta.json so readers can skip parsing the data file"""
+        table_counts = {}
+        db_rollup = {}
+        for database, tables in consolidated_data.items():
+            if database == 'extraction_metadata' or not isinstance(tables, dict):
+                continue
+            for table, table_data in tables.items():
+                if isinstance(table_data, dict) and 'records' in table_data:
+                    table_counts[f"{database}.{table}"] = table_data['records']
+                    db_tables, db_records = db_rollup.get(database, (0, 0))
+                    db_rollup[database] = (db_tables + 1, db_records + table_data['records'])
+        
+        with open(f"{filepath}.meta.json", 'w') as f:
+            json.dump({
+                'type': 'extracted',
+                'tables': table_counts,
+                'databases': db_rollup,
+                'total': sum(table_counts.values())
+            }, f)
+    
     # === Helper Methods ===
     
     
@@ -11,11 +11,68 @@ import tempfile
 import os
 import re
 import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+from src.config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+# SQLite rejects compound SELECTs with more terms than this (SQLITE_MAX_COMPOUND_SELECT)
+SQLITE_MAX_COMPOUND_SELECT = 500
+
+# Value conversions applied per column before a Snowflake COPY, chosen by column name
+_PLAIN_COLUMN = 0
+_TIMESTAMP_COLUMN = 1
+_BOOLEAN_COLUMN = 2
+
+# Explicitly named boolean columns
+BOOLEAN_COLUMNS = frozenset({'success', 'deprecated', 'auth_enabled', 'api_supported'})
+
+# Boolean for each 0/1 or 'true'/'false' spelling of a boolean column value (True and False
+# hash as 1 and 0, so booleans map to themselves)
+_BOOLEAN_VALUES = {0: False, 1: True, '0': False, '1': True, 'true': True, 'false': False, 'True': True, 'False': False}
+
+# JSON-valued columns whose names lack the _json suffix
+VARIANT_COLUMNS = frozenset({'new_entity_data'})
+
+
+@lru_cache(maxsize=None)
+def _snowflake_column_kind(col: str) -> int:
+    """Classify a column by its name: Unix-millisecond timestamp, 0/1 boolean, or plain"""
+    if col.endswith('_time') or col.endswith('_at') or col == 'timestamp':
+        return _TIMESTAMP_COLUMN
+    if ('is_' in col or col.endswith('_enabled') or col.endswith('_active') or
+            col.endswith('_supported') or col.endswith('_flaky') or col in BOOLEAN_COLUMNS):
+        return _BOOLEAN_COLUMN
+    return _PLAIN_COLUMN
+
+
+def _convert_boolean_column(col: str, value: Any) -> Any:
+    """Convert 0/1 and 'true'/'false' values of a boolean column to booleans; other values pass through"""
+    return _BOOLEAN_VALUES.get(value, value)
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote a table name for use in SQL (identifiers cannot be bound as parameters)"""
+    return '"' + name.replace('"', '""') + '"'
+
 
 class DataSource(ABC):
     """Abstract base class for data sources"""
@@ -89,6 +146,35 @@ class SQLiteDataSource(DataSource):
         """Get SQLite connection"""
         return self.connection
     
+    def get_table_names(self) -> List[str]:
+        """
+        Get the name of every table in the database without counting rows
+        
+        Returns:
+            List of table names
+        """
+        return [name for (name,) in self.connection.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+    
+    def get_table_row_counts(self) -> Dict[str, int]:
+        """
+        Get the row count of every table in the database
+        
+        Returns:
+            Dictionary mapping table name to row count
+        """
+        table_names = self.get_table_names()
+        
+        # Count every table in one UNION ALL query, batched to stay under SQLite's compound SELECT limit
+        row_counts = {}
+        for start in range(0, len(table_names), SQLITE_MAX_COMPOUND_SELECT):
+            batch = table_names[start:start + SQLITE_MAX_COMPOUND_SELECT]
+            query = " UNION ALL ".join(
+                f"SELECT ?, COUNT(*) FROM {_quote_identifier(name)}" for name in batch
+            )
+            row_counts.update(self.connection.execute(query, batch))
+        
+        return row_counts
+    
     def _init_database(self):
         """Initialize SQLite database with complete schema"""
         cursor = self.connection.cursor()
@@ -411,7 +497,7 @@ class SnowflakeDataSource(DataSource):
                         col_type = 'FLOAT'
                     elif isinstance(value, bool):
                         col_type = 'BOOLEAN'
-                    elif key.endswith('_json') or key in ['data_json', 'policy_json', 'config_json', 'changes_json']:
+                    elif key.endswith('_json'):
                         col_type = 'VARIANT'
                     elif key.endswith('_at') or key == 'timestamp':
                         col_type = 'TIMESTAMP'
@@ -558,7 +644,7 @@ class SnowflakeDataSource(DataSource):
                         col_type = "INTEGER PRIMARY KEY"
                 elif key.endswith('_at') or key == 'timestamp':
                     col_type = "TIMESTAMP"
-                elif key.endswith('_json') or key in ['data_json', 'policy_json', 'config_json', 'changes_json', 'headers_json', 'metrics_json', 'metadata_json', 'new_entity_data']:
+                elif key.endswith('_json') or key in VARIANT_COLUMNS:
                     col_type = "VARIANT"
                 elif isinstance(value, str) and len(value) > 255:
                     col_type = "TEXT"
@@ -587,56 +673,83 @@ class SnowflakeDataSource(DataSource):
             self.logger.error(error_msg)
             raise Exception(error_msg) from e
     
+    def _convert_epoch_millis(self, col: str, value: Any) -> Any:
+        """Convert a Unix timestamp in milliseconds to a Snowflake timestamp string; other values pass through"""
+        if not isinstance(value, (int, float)) or value <= 10000000000:
+            return value
+        
+        try:
+            # Handle out-of-range timestamps
+            max_timestamp = 253402300799000  # Dec 31, 9999
+            min_timestamp = -30610224000000  # Jan 1, 1000
+            
+            if value > max_timestamp or value < min_timestamp:
+                self.logger.warning(f"Timestamp {value} out of range for column {col}, using NULL")
+                return None
+            dt = datetime.fromtimestamp(value / 1000)
+            return dt.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        except (ValueError, OSError) as e:
+            self.logger.warning(f"Invalid timestamp {value} for column {col}: {e}, using NULL")
+            return None
+    
     def _insert_batch_with_copy(self, table_name: str, rows: List[Dict[str, Any]]) -> bool:
-        """Use COPY command for efficient bulk loading with JSON format"""
+        """Use COPY command for efficient bulk loading with Parquet (or JSON) format"""
         try:
-            # Create temporary file with JSON data
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp_file:
-                # Write as newline-delimited JSON (NDJSON)
-                for row in rows:
-                    # Process timestamps before writing
-                    processed_row = {}
-                    for col, value in row.items():
-                        if value is None:
-                            processed_row[col] = None
-                        elif isinstance(value, (dict, list)):
-                            processed_row[col] = value  # Keep as-is for JSON
-                        elif col.endswith('_time') or col.endswith('_at') or col == 'timestamp':
-                            # Convert Unix timestamps to ISO format for Snowflake
-                            if isinstance(value, (int, float)) and value > 10000000000:
-                                try:
-                                    # Handle out-of-range timestamps
-                                    max_timestamp = 253402300799000  # Dec 31, 9999
-                                    min_timestamp = -30610224000000  # Jan 1, 1000
-                                    
-                                    if value > max_timestamp or value < min_timestamp:
-                                        self.logger.warning(f"Timestamp {value} out of range for column {col}, using NULL")
-                                        processed_row[col] = None
-                                    else:
-                                        dt = datetime.fromtimestamp(value / 1000)
-                                        processed_row[col] = dt.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                                except (ValueError, OSError) as e:
-                                    self.logger.warning(f"Invalid timestamp {value} for column {col}: {e}, using NULL")
-                                    processed_row[col] = None
-                            else:
-                                processed_row[col] = value
-                        elif ('is_' in col or col.endswith('_enabled') or col.endswith('_active') or 
-                              col.endswith('_supported') or col.endswith('_flaky') or
-                              col in ('success', 'deprecated', 'auth_enabled', 'api_supported')):
-                            # Convert 0/1 to boolean for common boolean column patterns
-                            if value in (0, 1, '0', '1'):
-                                processed_row[col] = bool(int(value))
-                            elif value in (True, False, 'true', 'false', 'True', 'False'):
-                                processed_row[col] = value if isinstance(value, bool) else (value.lower() == 'true')
-                            else:
-                                processed_row[col] = value
-                        else:
-                            processed_row[col] = value
+            # Every column of the batch, in first-seen order: rows may carry different key sets
+            columns = list(dict.fromkeys(col for row in rows for col in row))
+            
+            # Process timestamps and booleans before writing. Only the batch's timestamp and
+            # boolean columns are visited per row, and rows are converted in place (both
+            # conversions leave already-converted values unchanged) instead of being copied
+            converters = []
+            for col in columns:
+                column_kind = _snowflake_column_kind(col)
+                if column_kind == _TIMESTAMP_COLUMN:
+                    converters.append((col, self._convert_epoch_millis))
+                elif column_kind == _BOOLEAN_COLUMN:
+                    converters.append((col, _convert_boolean_column))
+            
+            for row in rows:
+                for col, convert in converters:
+                    value = row.get(col)
+                    value_type = type(value)
+                    # None, dict and list values are kept as-is for JSON
+                    if value is not None and value_type is not dict and value_type is not list:
+                        row[col] = convert(col, value)
+            processed_rows = rows
                     
-                    json.dump(processed_row, tmp_file)
-                    tmp_file.write('\n')
+            # Parquet is columnar and compressed, so Snowflake ingests it faster than NDJSON.
+            # Batches with dict/list values stay NDJSON so VARIANT values keep their exact keys,
+            # and rows whose column types Arrow cannot unify fall back to NDJSON
+            file_format = 'JSON'
+            has_nested_values = any(
+                type(value) is dict or type(value) is list
+                for row in processed_rows for value in row.values()
+            )
+            tmp_path = None
+            if pa is not None and not has_nested_values:
+                try:
+                    # Each column is built over all rows (missing keys become nulls); from_pylist
+                    # would take the columns of the first row only and drop the rest
+                    arrow_table = pa.Table.from_pydict({
+                        col: [row.get(col) for row in processed_rows] for col in columns
+                    })
+                    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as tmp_file:
+                        tmp_path = tmp_file.name
+                    pq.write_table(arrow_table, tmp_path, compression='snappy')
+                    file_format = 'PARQUET'
+                except (pa.ArrowException, OverflowError, TypeError) as e:
+                    self.logger.debug(f"Parquet conversion failed for {table_name}, using JSON: {e}")
+                    if tmp_path is not None and os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
                 
-                tmp_path = tmp_file.name
+            if file_format == 'JSON':
+                # Create temporary file with JSON data, written as newline-delimited JSON (NDJSON)
+                with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp_file:
+                    for processed_row in processed_rows:
+                        json.dump(processed_row, tmp_file)
+                        tmp_file.write('\n')
+                    tmp_path = tmp_file.name
             
             # Create temporary stage
             stage_name = f"TEMP_STAGE_{table_name.upper()}_{os.getpid()}"
@@ -644,7 +757,9 @@ class SnowflakeDataSource(DataSource):
             
             # Upload file to stage with specific settings
             # Use PARALLEL to limit concurrent uploads and reduce SSL handshake issues
-            put_sql = f"PUT file://{tmp_path} @{stage_name} AUTO_COMPRESS=TRUE OVERWRITE=TRUE PARALLEL=4"
+            # Parquet files are already compressed
+            auto_compress = 'TRUE' if file_format == 'JSON' else 'FALSE'
+            put_sql = f"PUT file://{tmp_path} @{stage_name} AUTO_COMPRESS={auto_compress} OVERWRITE=TRUE PARALLEL=4"
             
             try:
                 self.cursor.execute(put_sql)
@@ -655,20 +770,29 @@ class SnowflakeDataSource(DataSource):
                 if "certificate" in error_msg.lower() or "254007" in error_msg:
                     # SSL certificate error - try alternative approach
                     self.logger.warning(f"SSL certificate error during PUT, trying alternative method: {error_msg}")
-                    # Fall back to regular INSERT for this batch
+                    # Fall back to regular INSERT for this batch. The rows were converted in place
+                    # above; that is safe because the INSERT path's conversions leave timestamp
+                    # strings and booleans unchanged
                     return self._insert_batch_original(table_name, rows)
                 else:
                     raise
             
-            # Create or replace file format for NDJSON
-            self.cursor.execute("""
-                CREATE OR REPLACE FILE FORMAT TEMP_JSON_FORMAT
-                TYPE = 'JSON'
-                STRIP_OUTER_ARRAY = FALSE
-                ENABLE_OCTAL = FALSE
-                ALLOW_DUPLICATE = FALSE
-                STRIP_NULL_VALUES = FALSE
-            """)
+            # Create or replace file format for the staged file
+            if file_format == 'PARQUET':
+                self.cursor.execute("""
+                    CREATE OR REPLACE FILE FORMAT TEMP_PARQUET_FORMAT
+                    TYPE = 'PARQUET'
+                    BINARY_AS_TEXT = TRUE
+                """)
+            else:
+                self.cursor.execute("""
+                    CREATE OR REPLACE FILE FORMAT TEMP_JSON_FORMAT
+                    TYPE = 'JSON'
+                    STRIP_OUTER_ARRAY = FALSE
+                    ENABLE_OCTAL = FALSE
+                    ALLOW_DUPLICATE = FALSE
+                    STRIP_NULL_VALUES = FALSE
+                """)
             
             # Get file name in stage (it might be compressed)
             list_sql = f"LIST @{stage_name}"
@@ -683,7 +807,7 @@ class SnowflakeDataSource(DataSource):
             copy_sql = f"""
                 COPY INTO {table_name}
                 FROM @{stage_name}/{os.path.basename(staged_file)}
-                FILE_FORMAT = (FORMAT_NAME = 'TEMP_JSON_FORMAT')
+                FILE_FORMAT = (FORMAT_NAME = 'TEMP_{file_format}_FORMAT')
                 MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
                 ON_ERROR = 'CONTINUE'
                 PURGE = TRUE
@@ -780,11 +904,15 @@ class SnowflakeDataSource(DataSource):
             # Get column names from first row
             columns = list(rows[0].keys())
             
+            # Whether each column holds Unix-millisecond timestamps, aligned with columns and
+            # decided once per batch rather than by suffix tests on every value
+            timestamp_columns = tuple(_snowflake_column_kind(col) == _TIMESTAMP_COLUMN for col in columns)
+            
             # Prepare values for bulk insert
             values_list = []
             for row in rows:
                 values = []
-                for col in columns:
+                for col, is_timestamp_column in zip(columns, timestamp_columns):
                     value = row.get(col)
                     
                     # Handle different data types
@@ -792,13 +920,12 @@ class SnowflakeDataSource(DataSource):
                         values.append(None)
                     elif isinstance(value, (dict, list)):
                         # Convert dict/list to JSON string for VARIANT columns
-                        values.append(json.dumps(value))
+                        values.append(orjson.dumps(value).decode('utf-8') if orjson is not None else json.dumps(value))
                     elif isinstance(value, bool):
                         values.append(value)
-                    elif col.endswith('_time') or col.endswith('_at') or col == 'timestamp':
+                    elif is_timestamp_column:
                         # Convert Unix timestamps (milliseconds) to datetime strings
                         if isinstance(value, (int, float)) and value > 10000000000:  # Unix timestamp in ms
-                            from datetime import datetime
                             dt = datetime.fromtimestamp(value / 1000)  # Convert from ms to seconds
                             values.append(dt.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3])  # Format for Snowflake
                         else:
@@ -837,4 +964,89 @@ class SnowflakeDataSource(DataSource):
         """Get Snowflake connection"""
         return self.connection
 
+    def get_table_names(self) -> List[str]:
+        """
+        Get the name of every table in the current schema without counting rows
+        
+        Returns:
+            List of table names
+        """
+        self.cursor.execute("""
+            SELECT TABLE_NAME
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = CURRENT_SCHEMA()
+            AND TABLE_TYPE = 'BASE TABLE'
+        """)
+        return [table_name for (table_name,) in self.cursor]
+    
+    def get_table_row_counts(self) -> Dict[str, int]:
+        """
+        Get the row count of every table in the current schema
+        
+        Reads ROW_COUNT from INFORMATION_SCHEMA.TABLES in a single metadata query
+        instead of one COUNT(*) round trip per table. COUNT(*) is only used for
+        tables whose ROW_COUNT is not populated.
+        
+        Returns:
+            Dictionary mapping table name to row count
+        """
+        self.cursor.execute("""
+            SELECT TABLE_NAME, ROW_COUNT
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = CURRENT_SCHEMA()
+            AND TABLE_TYPE = 'BASE TABLE'
+        """)
+        # Stream rows off the cursor instead of materializing the result set first
+        row_counts = dict(self.cursor)
+        
+        uncounted_tables = [table_name for table_name, row_count in row_counts.items() if row_count is None]
+        if uncounted_tables:
+            row_counts.update(self._count_rows_concurrently(uncounted_tables))
+        
+        return row_counts
+    
+    def _count_rows_concurrently(self, table_names: List[str]) -> Dict[str, int]:
+        """
+        Run COUNT(*) for several tables in parallel, one connection per worker thread
+        
+        Each COUNT(*) is a separate Snowflake round trip, so running them concurrently
+        hides most of the per-query latency. The number of workers is capped by
+        COUNT_POOL_SIZE; without it the tables are counted on this connection.
+        
+        Args:
+            table_names: Tables to count
+            
+        Returns:
+            Dictionary mapping table name to row count
+        """
+        pool_size = min(settings.COUNT_POOL_SIZE or 1, len(table_names))
+        if pool_size <= 1:
+            counts = {}
+            for table_name in table_names:
+                self.cursor.execute(f"SELECT COUNT(*) FROM {_quote_identifier(table_name)}")
+                counts[table_name] = self.cursor.fetchone()[0]
+            return counts
+        
+        # Each worker logs in on its first table, so the logins overlap instead of
+        # all happening up front before any COUNT(*) runs
+        worker_state = threading.local()
+        worker_sources = []
+        
+        def count_one(table_name: str):
+            cursor = getattr(worker_state, 'cursor', None)
+            if cursor is None:
+                data_source = SnowflakeDataSource(self.connection_url)
+                worker_sources.append(data_source)
+                data_source.connect()
+                cursor = worker_state.cursor = data_source.cursor
+            cursor.execute(f"SELECT COUNT(*) FROM {_quote_identifier(table_name)}")
+            return table_name, cursor.fetchone()[0]
+        
+        try:
+            with ThreadPoolExecutor(max_workers=pool_size) as executor:
+                return dict(executor.map(count_one, table_names))
+        finally:
+            for data_source in worker_sources:
+                data_source.disconnect()
+
 
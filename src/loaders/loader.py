@@ -5,15 +5,47 @@ This module provides a unified interface for loading transformed data into vario
 Automatically selects SQLite for local environment and Snowflake for production.
 """
 
+import io
 import json
 import logging
 import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from .base import BaseLoader
 from .data_sources import SQLiteDataSource, SnowflakeDataSource
 from src.config import settings
-from src.utils.memory_monitor import MemoryMonitor
+from src.utils.memory_monitor import (
+    MemoryMonitor, open_gzip_reader, open_plain_reader, relax_gc_for_bulk_processing
+)
+
+# Prefer ijson's C tokenizer; the default backend may be pure Python
+try:
+    import ijson.backends.yajl2_c as ijson
+except ImportError:
+    try:
+        import ijson.backends.yajl2_cffi as ijson
+    except ImportError:
+        try:
+            import ijson
+        except ImportError:
+            ijson = None
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a load; truthy when the load succeeded"""
+    
+    success: bool
+    total_records: int = 0
+    loaded_tables: int = 0
+    failed_tables: List[Any] = field(default_factory=list)
+    skipped_tables: List[str] = field(default_factory=list)
+    per_table_counts: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+    
+    def __bool__(self) -> bool:
+        return self.success
 
 
 class DataLoader(BaseLoader):
@@ -92,7 +124,7 @@ class DataLoader(BaseLoader):
         
         return self.data_source
     
-    def load(self, filepath: str) -> bool:
+    def load(self, filepath: str) -> LoadResult:
         """
         Load transformed data from JSON file into the configured data store
         
@@ -100,10 +132,8 @@ class DataLoader(BaseLoader):
             filepath: Path to the transformed JSON file (supports .gz compressed files)
             
         Returns:
-            bool: True if successful, False otherwise
+            LoadResult with per-table record counts (truthy if successful)
         """
-        import gzip
-        
         try:
             self.logger.info(f"Starting data load process")
             self.logger.info(f"Source file: {filepath}")
@@ -132,7 +162,7 @@ class DataLoader(BaseLoader):
             
             if not tables:
                 self.logger.error("No tables found in the JSON file")
-                return False
+                return LoadResult(success=False, error="No tables found in the JSON file")
             
             self.logger.info(f"Found {len(tables)} tables to load")
             
@@ -148,6 +178,7 @@ class DataLoader(BaseLoader):
                 loaded_tables = 0
                 failed_tables = []
                 skipped_tables = []
+                per_table_counts = {}
                 
                 # Log loading strategy
                 self.logger.info(f"Loading strategy: {self.settings.LOAD_STRATEGY}")
@@ -178,12 +209,20 @@ class DataLoader(BaseLoader):
                             
                             if self.settings.LOAD_STRATEGY == 'fail_fast':
                                 self.logger.error("Load strategy is 'fail_fast' - stopping ETL")
-                                return False
+                                return LoadResult(
+                                    success=False,
+                                    total_records=total_records,
+                                    loaded_tables=loaded_tables,
+                                    failed_tables=failed_tables,
+                                    skipped_tables=skipped_tables,
+                                    per_table_counts=per_table_counts
+                                )
                             else:
                                 continue
                         
                         total_records += record_count
                         loaded_tables += 1
+                        per_table_counts[table_name] = record_count
                         self.logger.info(f"✅ Successfully loaded {record_count:,} records into '{table_name}'")
                         
                     except Exception as e:
@@ -237,13 +276,14 @@ class DataLoader(BaseLoader):
                     self.logger.info("Load completed successfully")
                 
                 # Return detailed results
-                return {
-                    'success': success,
-                    'loaded_tables': loaded_tables,
-                    'failed_tables': failed_tables,
-                    'total_records': total_records,
-                    'skipped_tables': skipped_tables
-                }
+                return LoadResult(
+                    success=success,
+                    total_records=total_records,
+                    loaded_tables=loaded_tables,
+                    failed_tables=failed_tables,
+                    skipped_tables=skipped_tables,
+                    per_table_counts=per_table_counts
+                )
                 
             finally:
                 # Always disconnect
@@ -254,16 +294,10 @@ class DataLoader(BaseLoader):
         except Exception as e:
             self.logger.error(f"Error loading data: {e}")
             self.logger.exception("Detailed error information:")
-            return {
-                'success': False,
-                'loaded_tables': 0,
-                'failed_tables': [],
-                'total_records': 0,
-                'skipped_tables': [],
-                'error': str(e)
-            }
+            return LoadResult(success=False, error=str(e))
     
-    def _load_streaming(self, filepath: str) -> bool:
+    @relax_gc_for_bulk_processing()
+    def _load_streaming(self, filepath: str) -> LoadResult:
         """
         Load data using streaming approach for large files
         
@@ -274,17 +308,10 @@ class DataLoader(BaseLoader):
             filepath: Path to the transformed JSON file
             
         Returns:
-            bool: True if successful, False otherwise
+            LoadResult with per-table record counts (truthy if successful)
         """
-        import gc
-        import json
-        import os
-        try:
-            import ijson
-            has_ijson = True
-        except ImportError:
+        if ijson is None:
             self.logger.info("ijson not available, using standard JSON streaming")
-            has_ijson = False
         
         try:
             # Get data source and connect
@@ -298,10 +325,15 @@ class DataLoader(BaseLoader):
             loaded_tables = 0
             failed_tables = []
             skipped_tables = []
+            per_table_counts = {}
             
-            # First, extract table names from the file
+            # First, extract table names from the manifest or the file itself
             self.logger.info("Analyzing file structure...")
-            table_names = self._extract_table_names(filepath)
+            table_manifest = self._read_table_manifest(filepath)
+            if table_manifest is not None:
+                table_names = list(table_manifest)
+            else:
+                table_names = self._extract_table_names(filepath)
             self.logger.info(f"Found {len(table_names)} tables to load")
             
             # Initialize progress tracker
@@ -312,17 +344,14 @@ class DataLoader(BaseLoader):
             if tracker:
                 tracker.start_phase("Loading", len(table_names))
             
-            # Process each table one by one
-            for idx, table_name in enumerate(table_names):
+            # Process each table one by one, as a single pass over the file reaches it
+            for idx, (table_name, table_data) in enumerate(self._iter_tables(filepath, table_names)):
                 self.logger.info(f"[{idx+1}/{len(table_names)}] Loading table: {table_name}")
                 
                 try:
-                    # Check memory before loading table
+                    # Check memory after reading the table
                     self.memory_monitor.check_memory(f"before loading {table_name}")
                     
-                    # Extract just this table's data from the file
-                    table_data = self._extract_single_table(filepath, table_name)
-                    
                     if not table_data:
                         self.logger.warning(f"Table '{table_name}' has no records, skipping")
                         skipped_tables.append(table_name)
@@ -341,6 +370,7 @@ class DataLoader(BaseLoader):
                     if success:
                         loaded_tables += 1
                         total_records += len(table_data)
+                        per_table_counts[table_name] = len(table_data)
                         self.logger.info(f"  Successfully loaded {len(table_data):,} records into '{table_name}'")
                     else:
                         failed_tables.append(table_name)
@@ -348,7 +378,6 @@ class DataLoader(BaseLoader):
                     
                     # Clear memory after each table
                     del table_data
-                    gc.collect()
                     
                     # Log memory status
                     self.memory_monitor.log_memory_status(f"After loading {table_name}")
@@ -383,39 +412,64 @@ class DataLoader(BaseLoader):
             
             self.logger.info("=" * 60)
             
-            return {
-                'success': len(failed_tables) == 0,
-                'loaded_tables': loaded_tables,
-                'failed_tables': failed_tables,
-                'total_records': total_records,
-                'skipped_tables': skipped_tables
-            }
+            return LoadResult(
+                success=len(failed_tables) == 0,
+                total_records=total_records,
+                loaded_tables=loaded_tables,
+                failed_tables=failed_tables,
+                skipped_tables=skipped_tables,
+                per_table_counts=per_table_counts
+            )
             
         except Exception as e:
             self.logger.error(f"Error in streaming loader: {str(e)}")
             import traceback
             traceback.print_exc()
-            return {
-                'success': False,
-                'loaded_tables': 0,
-                'failed_tables': [],
-                'total_records': 0,
-                'skipped_tables': [],
-                'error': str(e)
-            }
+            return LoadResult(success=False, error=str(e))
+    
+    def _read_table_manifest(self, filepath: str) -> Optional[Dict[str, int]]:
+        """
+        Read per-table record counts from the <file>.meta.json manifest written by the transformer
+        
+        Args:
+            filepath: Path to the transformed JSON file
+        
+        Returns:
+            Dictionary mapping table name to record count, or None if no up-to-date manifest exists
+        """
+        meta_path = f"{filepath}.meta.json"
+        try:
+            # Ignore manifests that predate the data file they describe
+            if os.path.getmtime(meta_path) < os.path.getmtime(filepath):
+                return None
+            with open(meta_path, 'r') as f:
+                return json.load(f)['tables']
+        except (OSError, ValueError, KeyError):
+            return None
     
     def _extract_table_names(self, filepath: str) -> List[str]:
         """
         Extract table names from the JSON file without loading the entire file
         Supports both regular and gzip-compressed files
         """
-        import gzip
-        
         table_names = []
         
+        if ijson is not None:
+            # Table names are the keys directly under "tables"; the C tokenizer walks
+            # the values instead of building a Python string one character at a time
+            with (open_gzip_reader(filepath) if filepath.endswith('.gz') else open_plain_reader(filepath)) as f:
+                for prefix, event, value in ijson.parse(f, use_float=True):
+                    if prefix == 'tables':
+                        if event == 'map_key':
+                            table_names.append(value)
+                        elif event == 'end_map':
+                            break
+            return table_names
+        
         # Open file based on type
         if filepath.endswith('.gz'):
-            f = gzip.open(filepath, 'rt', encoding='utf-8')
+            # ISA-L (when installed) and a 128 KiB buffer instead of gzip's 8 KiB reads
+            f = io.TextIOWrapper(open_gzip_reader(filepath), encoding='utf-8')
         else:
             f = open(filepath, 'r')
         
@@ -457,45 +511,45 @@ class DataLoader(BaseLoader):
         
         return table_names
     
-    def _extract_single_table(self, filepath: str, table_name: str) -> List[Dict]:
-        """
-        Extract a single table's data from the JSON file using ijson for streaming
-        Supports both regular and gzip-compressed files
+    def _iter_tables(self, filepath: str, table_names: List[str]) -> Iterator[Tuple[str, List[Dict]]]:
         """
-        import gzip
+        Yield (table_name, records) for each table in the file, one table in memory at a time
         
-        try:
-            # Try to use ijson for efficient streaming if available
-            import ijson
-            
-            # Open file based on type
-            if filepath.endswith('.gz'):
-                f = gzip.open(filepath, 'rb')
-            else:
-                f = open(filepath, 'rb')
-            
-            try:
-                parser = ijson.items(f, f'tables.{table_name}.item')
-                return list(parser)
-            finally:
-                f.close()
-                
-        except ImportError:
+        With ijson the file is decompressed and parsed once for all tables, instead of
+        once per table. Supports both regular and gzip-compressed files.
+        
+        Args:
+            filepath: Path to the transformed JSON file
+            table_names: Names of the tables in the file (used by the non-ijson fallback)
+        
+        Returns:
+            Iterator over the file's tables in file order
+        """
+        if ijson is None:
             # Fallback to manual parsing if ijson not available
             self.logger.warning("ijson not available, using fallback parser")
-            return self._extract_single_table_fallback(filepath, table_name)
+            for table_name in table_names:
+                yield table_name, self._extract_single_table_fallback(filepath, table_name)
+            return
+        
+        # Open file based on type
+        if filepath.endswith('.gz'):
+            f = open_gzip_reader(filepath)
+        else:
+            f = open_plain_reader(filepath)
+        
+        with f:
+            yield from ijson.kvitems(f, 'tables', use_float=True)
     
     def _extract_single_table_fallback(self, filepath: str, table_name: str) -> List[Dict]:
         """
         Fallback method to extract table data without ijson
         Supports both regular and gzip-compressed files
         """
-        import json
-        import gzip
-        
         # Open file based on type
         if filepath.endswith('.gz'):
-            f = gzip.open(filepath, 'rt', encoding='utf-8')
+            # ISA-L (when installed) and a 128 KiB buffer instead of gzip's 8 KiB reads
+            f = io.TextIOWrapper(open_gzip_reader(filepath), encoding='utf-8')
         else:
             f = open(filepath, 'r')
         
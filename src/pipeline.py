@@ -5,11 +5,38 @@ This module orchestrates the Extract, Transform, and Load process
 for analytics data from MySQL to Snowflake/SQLite.
 """
 
+import io
 import json
 import logging
+import logging.handlers
+import os
+import queue
+import time
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import ijson.backends.yajl2_c as ijson
+except ImportError:
+    try:
+        import ijson.backends.yajl2_cffi as ijson
+    except ImportError:
+        try:
+            import ijson
+        except ImportError:
+            ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
 
 from src.extractors.extractor import DataExtractor
 from src.loaders.loader import DataLoader
@@ -17,6 +44,24 @@ from src.transformers.transformer import DataTransformer
 from src.config import settings
 from src.notifications import notifier
 from src.utils.env_updater import update_extraction_state, reset_skip_flags
+from src.utils.memory_monitor import open_gzip_reader, open_plain_reader
+
+# File type, per-table record counts and per-database (tables, records) rollup
+FileMetrics = Tuple[str, Dict[str, int], Dict[str, Tuple[int, int]]]
+
+LOG_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Bytes read from the start of a data file to detect its type
+SNIFF_HEAD_BYTES = 64 * 1024
+
+# Uncompressed files up to this size are parsed whole with simdjson instead of streamed
+SIMDJSON_MAX_BYTES = 64 * 1024 * 1024
+
+# Suffix of the 'database.table.records' prefix holding a table's record count
+RECORDS_SUFFIX = '.records'
+RECORDS_SUFFIX_LEN = len(RECORDS_SUFFIX)
+
+JSON_OBJECT_TYPES = (dict,) if simdjson is None else (dict, simdjson.Object)
 
 
 class Pipeline:
@@ -33,8 +78,10 @@ class Pipeline:
         self.extraction_start_date_override = extraction_start_date
         self.logger = self._setup_logging()
         self.metrics = self._initialize_metrics()
+        self._metrics_cache = {}
         self.job_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.etl_id = self.job_id  # Use job_id as ETL ID for consistency
+        self.metrics_path = Path(self.config.LOG_DIR) / f"etl_metrics_{self.job_id}.json"
         self.logger.info(f"Initializing ETL Pipeline in {self.config.ENVIRONMENT} mode")
         self.logger.info(f"ETL Run ID: {self.etl_id}")
         if extraction_start_date:
@@ -57,7 +104,6 @@ class Pipeline:
         # Console handler
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(log_format)
-        root_logger.addHandler(console_handler)
         
         # File handler for all ETL logs
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -65,13 +111,55 @@ class Pipeline:
         log_dir.mkdir(exist_ok=True)
         
         log_file = log_dir / f"etl_pipeline_{timestamp}.log"
-        file_handler = logging.FileHandler(log_file)
+        file_handler = logging.handlers.RotatingFileHandler(log_file, encoding='utf-8', delay=True)
         file_handler.setFormatter(log_format)
-        root_logger.addHandler(file_handler)
+        
+        # Hand records to a background listener so console/file I/O never blocks the pipeline
+        log_queue = queue.Queue(-1)
+        self._queue_handler = logging.handlers.QueueHandler(log_queue)
+        root_logger.addHandler(self._queue_handler)
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        self._log_listener.start()
         
         # Return pipeline-specific logger
         return logging.getLogger(__name__)
     
+    def _stop_log_listener(self):
+        """Flush queued log records and attach the handlers directly to the root logger again"""
+        if self._log_listener is None:
+            return
+        
+        self._log_listener.stop()
+        
+        root_logger = logging.getLogger()
+        root_logger.removeHandler(self._queue_handler)
+        for handler in self._log_listener.handlers:
+            root_logger.addHandler(handler)
+        
+        self._log_listener = None
+    
+    @cached_property
+    def _extractor(self) -> DataExtractor:
+        """Extractor created on first use and kept so its MySQL connection pool is reused"""
+        custom_config = None
+        if self.extraction_start_date_override:
+            custom_config = {
+                'extraction_start_date_override': self.extraction_start_date_override
+            }
+        return DataExtractor(custom_config)
+    
+    @cached_property
+    def _transformer(self) -> DataTransformer:
+        """Transformer created on first use and shared across runs of this pipeline"""
+        return DataTransformer()
+    
+    @cached_property
+    def _loader(self) -> DataLoader:
+        """Loader created on first use and kept so its data source is reused"""
+        return DataLoader()
+    
     def _initialize_metrics(self) -> Dict:
         """Initialize metrics tracking dictionary"""
         return {
@@ -80,7 +168,8 @@ class Pipeline:
             'duration_seconds': None,
             'extraction': {
                 'records_extracted': 0,
-                'tables_extracted': []
+                'tables_extracted': [],
+                'output_file': None
             },
             'transformation': {
                 'records_transformed': 0,
@@ -111,7 +200,11 @@ class Pipeline:
             
             # Find the latest extracted file
             output_dir = Path(self.config.OUTPUT_DIR) / "extracted"
-            extracted_files = list(output_dir.glob("extracted_data_*.json"))
+            # The <file>.meta.json sidecars match the pattern too, and are written after their data file
+            extracted_files = [
+                path for path in output_dir.glob("extracted_data_*.json")
+                if not path.name.endswith('.meta.json')
+            ]
             
             if not extracted_files:
                 raise FileNotFoundError("No extracted files found to skip extraction")
@@ -120,16 +213,12 @@ class Pipeline:
             latest_file = max(extracted_files, key=lambda p: p.stat().st_mtime)
             self.logger.info(f"Using existing extracted file: {latest_file}")
             
-            # Update metrics
-            with open(latest_file, 'r') as f:
-                data = json.load(f)
-                for db_name, db_data in data.items():
-                    if db_name == 'extraction_metadata':
-                        continue
-                    for table_name, table_info in db_data.items():
-                        if isinstance(table_info, dict) and 'records' in table_info:
-                            self.metrics['extraction']['records_extracted'] += table_info['records']
-                            self.metrics['extraction']['tables_extracted'].append(f"{db_name}.{table_name}")
+            # Update metrics, reusing the counts saved by the run that extracted this file
+            if not self._load_metrics_if_resume(latest_file):
+                _, table_counts, _ = self._get_file_metrics_streaming(latest_file)
+                self.metrics['extraction']['records_extracted'] = sum(table_counts.values())
+                self.metrics['extraction']['tables_extracted'] = list(table_counts)
+                self.metrics['extraction']['output_file'] = str(latest_file)
             
             return str(latest_file)
         
@@ -137,7 +226,7 @@ class Pipeline:
         self.logger.info("EXTRACTION PHASE STARTED")
         self.logger.info("=" * 60)
         
-        extraction_start = datetime.now()
+        extraction_start = time.monotonic()
         
         try:
             self.logger.info("MySQL Connections:")
@@ -146,48 +235,25 @@ class Pipeline:
             self.logger.info(f"  - Tenant: {self.config.TENANT_MYSQL_CONNECTION_URL}")
             self.logger.info(f"DB Keywords Filter: {self.config.EXTRACT_DB_KEYWORDS}")
             
-            # Create custom config if we have an override
-            custom_config = None
             if self.extraction_start_date_override:
-                custom_config = {
-                    'extraction_start_date_override': self.extraction_start_date_override
-                }
                 self.logger.info(f"Using extraction start date override: {self.extraction_start_date_override}")
             
-            extractor = DataExtractor(custom_config)
-            
             # Extract from all configured databases
             self.logger.info("Initiating database extraction...")
-            extracted_file = extractor.extract_all_databases(etl_id=self.etl_id)
+            extracted_file = self._extractor.extract_all_databases(etl_id=self.etl_id)
             
             # Update metrics
-            with open(extracted_file, 'r') as f:
-                data = json.load(f)
-                total_databases = len(data)
+            _, table_counts, db_rollup = self._get_file_metrics_streaming(extracted_file)
+            self.metrics['extraction']['records_extracted'] = sum(table_counts.values())
+            self.metrics['extraction']['tables_extracted'] = list(table_counts)
+            self.metrics['extraction']['output_file'] = str(extracted_file)
                 
-                self.logger.info(f"Successfully extracted data from {total_databases} databases")
-                
-            for database, tables in data.items():
-                # Skip metadata sections
-                if database == 'extraction_metadata':
-                    continue
-                    
-                db_records = 0
-                db_tables = len(tables)
-                
-                for table, table_data in tables.items():
-                    # Skip if table_data is not a dictionary
-                    if not isinstance(table_data, dict):
-                        continue
-                        
-                    record_count = table_data.get('records', 0)
-                    db_records += record_count
-                    self.metrics['extraction']['records_extracted'] += record_count
-                    self.metrics['extraction']['tables_extracted'].append(f"{database}.{table}")
+            self.logger.info(f"Successfully extracted data from {len(db_rollup)} databases")
                 
+            for database, (db_tables, db_records) in db_rollup.items():
                 self.logger.info(f"  - Database '{database}': {db_tables} tables, {db_records:,} records")
             
-            extraction_time = (datetime.now() - extraction_start).total_seconds()
+            extraction_time = time.monotonic() - extraction_start
             
             self.logger.info("=" * 60)
             self.logger.info(
@@ -228,32 +294,26 @@ class Pipeline:
         self.logger.info("TRANSFORMATION PHASE STARTED")
         self.logger.info("=" * 60)
         
-        transformation_start = datetime.now()
+        transformation_start = time.monotonic()
         
         try:
             self.logger.info(f"Input file: {extracted_file}")
             self.logger.info("Loading transformation mappings...")
             
-            transformer = DataTransformer()
-            
             # Transform the data
             self.logger.info("Applying transformations based on Snowflake schema...")
-            transformed_file = transformer.transform_file(extracted_file, self.etl_id)
+            transformed_file = self._transformer.transform_file(extracted_file, self.etl_id)
             
             # Update metrics
-            with open(transformed_file, 'r') as f:
-                data = json.load(f)
-                tables = data.get('tables', {})
+            _, table_counts, _ = self._get_file_metrics_streaming(transformed_file)
+            self.metrics['transformation']['records_transformed'] = sum(table_counts.values())
+            self.metrics['transformation']['tables_transformed'] = list(table_counts)
+            self.logger.info(f"Successfully transformed {len(table_counts)} tables:")
                 
-                self.logger.info(f"Successfully transformed {len(tables)} tables:")
+            for table_name, record_count in table_counts.items():
+                self.logger.info(f"  - {table_name}: {record_count:,} records")
                 
-                for table_name, records in tables.items():
-                    record_count = len(records)
-                    self.metrics['transformation']['records_transformed'] += record_count
-                    self.metrics['transformation']['tables_transformed'].append(table_name)
-                    self.logger.info(f"  - {table_name}: {record_count:,} records")
-            
-            transformation_time = (datetime.now() - transformation_start).total_seconds()
+            transformation_time = time.monotonic() - transformation_start
             
             self.logger.info("=" * 60)
             self.logger.info(
@@ -287,7 +347,7 @@ class Pipeline:
         self.logger.info("LOADING PHASE STARTED")
         self.logger.info("=" * 60)
         
-        loading_start = datetime.now()
+        loading_start = time.monotonic()
         
         try:
             self.logger.info(f"Input file: {transformed_file}")
@@ -301,46 +361,29 @@ class Pipeline:
             else:
                 self.logger.info(f"SQLite Connection: {self.config.SQLITE_CONNECTION_URL}")
             
-            loader = DataLoader()
-            
             # Load the data
             self.logger.info("Initiating data load...")
-            result = loader.load(transformed_file)
-            
-            # Handle backward compatibility - if result is boolean
-            if isinstance(result, bool):
-                success = result
-                if success:
-                    # Old behavior - update from file
-                    with open(transformed_file, 'r') as f:
-                        data = json.load(f)
-                        tables = data.get('tables', {})
+            result = self._loader.load(transformed_file)
+            
+            success = result.success
+            self.metrics['loading']['records_loaded'] = result.total_records
+            self.metrics['loading']['tables_loaded'] = list(result.per_table_counts)
+            self.metrics['loading']['tables_loaded_count'] = result.loaded_tables
+            self.metrics['loading']['failed_tables'] = result.failed_tables
                         
-                        for table_name, records in tables.items():
-                            record_count = len(records)
-                            self.metrics['loading']['records_loaded'] += record_count
-                            self.metrics['loading']['tables_loaded'].append(table_name)
-            else:
-                # New behavior - use detailed result
-                success = result['success']
-                self.metrics['loading']['records_loaded'] = result['total_records']
-                self.metrics['loading']['tables_loaded_count'] = result['loaded_tables']
-                self.metrics['loading']['failed_tables'] = result['failed_tables']
-                
-                # Log detailed results
-                if result['failed_tables']:
-                    self.logger.warning(f"Loading completed with {len(result['failed_tables'])} failed tables")
+            # Log detailed results
+            if result.failed_tables:
+                self.logger.warning(f"Loading completed with {len(result.failed_tables)} failed tables")
                 
-            loading_time = (datetime.now() - loading_start).total_seconds()
+            loading_time = time.monotonic() - loading_start
             
             self.logger.info("=" * 60)
             self.logger.info(
                 f"LOADING PHASE {'COMPLETED' if success else 'FAILED'} in {loading_time:.2f}s"
             )
-            if isinstance(result, dict):
-                self.logger.info(f"Tables loaded: {result['loaded_tables']}")
-                self.logger.info(f"Tables failed: {len(result['failed_tables'])}")
-                self.logger.info(f"Records loaded: {result['total_records']:,}")
+            self.logger.info(f"Tables loaded: {result.loaded_tables}")
+            self.logger.info(f"Tables failed: {len(result.failed_tables)}")
+            self.logger.info(f"Records loaded: {result.total_records:,}")
             self.logger.info("=" * 60)
             
             if not success:
@@ -380,10 +423,11 @@ class Pipeline:
         self.logger.info("#" * 60)
         self.logger.info("ETL PIPELINE STARTED")
         self.logger.info(f"Environment: {self.config.ENVIRONMENT}")
-        self.logger.info(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        self.logger.info("#" * 60)
-        
         self.metrics['start_time'] = datetime.now()
+        run_start = time.monotonic()
+        
+        self.logger.info(f"Start Time: {self.metrics['start_time'].strftime(LOG_TIMESTAMP_FORMAT)}")
+        self.logger.info("#" * 60)
         
         # Send start notification
         notifier.notify_etl_started(self.job_id)
@@ -392,10 +436,12 @@ class Pipeline:
             # Extract
             extracted_file = self.extract()
             self.metrics['extraction']['success'] = True
+            self._save_metrics()
             
             # Transform
             transformed_file = self.transform(extracted_file)
             self.metrics['transformation']['success'] = True
+            self._save_metrics()
             
             # Load
             success = self.load(transformed_file)
@@ -407,9 +453,7 @@ class Pipeline:
                 self.logger.info("✅ Reset SKIP_EXTRACTION=false for next run")
             
             self.metrics['end_time'] = datetime.now()
-            self.metrics['duration_seconds'] = (
-                self.metrics['end_time'] - self.metrics['start_time']
-            ).total_seconds()
+            self.metrics['duration_seconds'] = time.monotonic() - run_start
             
             self._save_metrics()
             
@@ -418,7 +462,7 @@ class Pipeline:
                 f"ETL PIPELINE COMPLETED SUCCESSFULLY in {self.metrics['duration_seconds']:.2f} seconds"
             )
             self.logger.info(f"Total Records Processed: {self.metrics['loading']['records_loaded']:,}")
-            self.logger.info(f"End Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            self.logger.info(f"End Time: {self.metrics['end_time'].strftime(LOG_TIMESTAMP_FORMAT)}")
             self.logger.info("#" * 60)
             
             # Send completion notification
@@ -428,9 +472,7 @@ class Pipeline:
             
         except Exception as e:
             self.metrics['end_time'] = datetime.now()
-            self.metrics['duration_seconds'] = (
-                self.metrics['end_time'] - self.metrics['start_time']
-            ).total_seconds()
+            self.metrics['duration_seconds'] = time.monotonic() - run_start
             
             # Mark phases that didn't succeed
             if 'extraction' not in self.metrics or not self.metrics['extraction'].get('success'):
@@ -459,6 +501,9 @@ class Pipeline:
             
             return False
     
+        finally:
+            self._stop_log_listener()
+    
     def run_from_file(self, source_file: str) -> bool:
         """
         Run pipeline starting from an already extracted file
@@ -471,18 +516,21 @@ class Pipeline:
         """
         self.logger.info(f"Starting ETL pipeline from file: {source_file}")
         self.metrics['start_time'] = datetime.now()
+        run_start = time.monotonic()
         
         # Send start notification
         notifier.notify_etl_started(self.job_id)
         
         try:
             # Check if file needs transformation or can be loaded directly
-            with open(source_file, 'r') as f:
-                data = json.load(f)
+            file_type, table_counts = self._detect_file_type(source_file)
             
             # If file has 'tables' key, it's already transformed
-            if 'tables' in data:
+            if file_type == 'transformed':
                 transformed_file = source_file
+                if table_counts:
+                    self.metrics['transformation']['records_transformed'] = sum(table_counts.values())
+                    self.metrics['transformation']['tables_transformed'] = list(table_counts)
                 self.metrics['transformation']['success'] = True
             else:
                 # Transform the file
@@ -490,16 +538,18 @@ class Pipeline:
                 self.metrics['transformation']['success'] = True
             
             # Mark extraction as skipped but successful (using existing file)
+            if file_type == 'extracted' and table_counts:
+                self.metrics['extraction']['records_extracted'] = sum(table_counts.values())
+                self.metrics['extraction']['tables_extracted'] = list(table_counts)
             self.metrics['extraction']['success'] = True
+            self._save_metrics()
             
             # Load
             success = self.load(transformed_file)
             self.metrics['success'] = success
             
             self.metrics['end_time'] = datetime.now()
-            self.metrics['duration_seconds'] = (
-                self.metrics['end_time'] - self.metrics['start_time']
-            ).total_seconds()
+            self.metrics['duration_seconds'] = time.monotonic() - run_start
             
             self._save_metrics()
             
@@ -510,9 +560,7 @@ class Pipeline:
             
         except Exception as e:
             self.metrics['end_time'] = datetime.now()
-            self.metrics['duration_seconds'] = (
-                self.metrics['end_time'] - self.metrics['start_time']
-            ).total_seconds()
+            self.metrics['duration_seconds'] = time.monotonic() - run_start
             
             # Mark failure
             self.metrics['success'] = False
@@ -536,16 +584,258 @@ class Pipeline:
             
             return False
     
+        finally:
+            self._stop_log_listener()
+    
+    def _open_data_file(self, filepath: str):
+        """
+        Open an extracted or transformed data file for binary streaming reads
+        
+        Args:
+            filepath: Path to data file (.json or .json.gz)
+        """
+        if str(filepath).endswith('.gz'):
+            return open_gzip_reader(filepath)
+        return open_plain_reader(filepath)
+    
+    def _detect_file_type(self, filepath: str) -> Tuple[str, Dict[str, int]]:
+        """
+        Detect whether a data file is extracted or transformed as cheaply as possible
+        
+        Uses the metadata sidecar when present, then the first bytes of the file,
+        and only streams the whole file if the head is inconclusive.
+        
+        Args:
+            filepath: Path to extracted or transformed data file
+            
+        Returns:
+            Tuple of file type and per-table record counts (empty if they were not needed)
+        """
+        sidecar_metrics = self._read_metadata_sidecar(filepath, os.stat(filepath))
+        if sidecar_metrics:
+            return sidecar_metrics[:2]
+        
+        file_type = self._sniff_file_type(filepath)
+        if file_type:
+            return file_type, {}
+        
+        return self._get_file_metrics_streaming(filepath)[:2]
+    
+    def _sniff_file_type(self, filepath: str) -> Optional[str]:
+        """
+        Detect the data file type from a bounded head of the file
+        
+        Args:
+            filepath: Path to extracted or transformed data file
+            
+        Returns:
+            'extracted' or 'transformed', or None if the head did not contain a top-level key
+        """
+        if ijson is None:
+            return None
+        
+        with self._open_data_file(filepath) as f:
+            head = f.read(SNIFF_HEAD_BYTES)
+        
+        try:
+            for prefix, event, value in ijson.parse(io.BytesIO(head), use_float=True):
+                if prefix == '' and event == 'map_key' and value != 'etl_timestamp':
+                    return 'transformed' if value == 'tables' else 'extracted'
+        except Exception:
+            # The head is cut mid-document, so running out of input is expected here
+            pass
+        
+        return None
+    
+    def _get_file_metrics_streaming(self, filepath: str) -> FileMetrics:
+        """
+        Detect the data file type and count its records in a single streaming pass
+        
+        Args:
+            filepath: Path to extracted or transformed data file (.json or .json.gz)
+            
+        Returns:
+            Tuple of file type ('extracted' or 'transformed'), a dictionary mapping
+            table name ('database.table' for extracted files) to record count, and a
+            per-database (tables, records) rollup (empty for transformed files)
+        """
+        # The same artifact is counted by several phases - only rescan it if it changed
+        stat = os.stat(filepath)
+        cache_key = (str(filepath), stat.st_mtime_ns, stat.st_size)
+        if cache_key not in self._metrics_cache:
+            self._metrics_cache[cache_key] = (
+                self._read_metadata_sidecar(filepath, stat) or self._scan_file_metrics(filepath)
+            )
+        return self._metrics_cache[cache_key]
+    
+    def _read_metadata_sidecar(self, filepath: str, stat: os.stat_result) -> Optional[FileMetrics]:
+        """
+        Read record counts from the <file>.meta.json sidecar written by the extractor/transformer
+        
+        Args:
+            filepath: Path to data file
+            stat: Stat result of the data file
+            
+        Returns:
+            Tuple of file type, per-table record counts and per-database rollup,
+            or None if no usable sidecar exists
+        """
+        meta_path = Path(f"{filepath}.meta.json")
+        try:
+            # A sidecar older than its data file describes a previous version of it
+            if meta_path.stat().st_mtime_ns < stat.st_mtime_ns:
+                return None
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            return meta['type'], meta['tables'], meta.get('databases', {})
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _scan_file_metrics(self, filepath: str) -> FileMetrics:
+        """Stream a data file once to detect its type and count its records"""
+        if (simdjson is not None and not str(filepath).endswith('.gz')
+                and os.path.getsize(filepath) < SIMDJSON_MAX_BYTES):
+            try:
+                parser = simdjson.Parser()
+                return self._count_records_from_data(parser.parse(Path(filepath).read_bytes()))
+            except ValueError:
+                # Not valid JSON for simdjson - let the streaming parser report it
+                pass
+        
+        with self._open_data_file(filepath) as f:
+            if ijson is None:
+                return self._count_records_from_data(json.load(f))
+            
+            parser = ijson.parse(f, use_float=True)
+            for prefix, event, value in parser:
+                if prefix == '' and event == 'map_key' and value != 'etl_timestamp':
+                    if value == 'tables':
+                        return 'transformed', self._count_transformed_from_parser(parser), {}
+                    return ('extracted', *self._count_extracted_from_parser(parser))
+        
+        return 'extracted', {}, {}
+    
+    def _count_extracted_from_parser(self, parser) -> Tuple[Dict[str, int], Dict[str, Tuple[int, int]]]:
+        """
+        Count records per 'database.table' from an already advanced ijson parser
+        
+        The per-database (tables, records) rollup is accumulated in the same pass.
+        """
+        table_counts = {}
+        db_rollup = {}
+        
+        for prefix, event, value in parser:
+            # Numbers inside sample rows are the bulk of events: reject them with one slice compare
+            if event == 'number' and prefix[-RECORDS_SUFFIX_LEN:] == RECORDS_SUFFIX and prefix.count('.') == 2:
+                table_key = prefix[:-RECORDS_SUFFIX_LEN]
+                database = table_key.partition('.')[0]
+                if database != 'extraction_metadata':
+                    record_count = int(value)
+                    table_counts[table_key] = record_count
+                    db_tables, db_records = db_rollup.get(database, (0, 0))
+                    db_rollup[database] = (db_tables + 1, db_records + record_count)
+        
+        return table_counts, db_rollup
+    
+    def _count_transformed_from_parser(self, parser) -> Dict[str, int]:
+        """Count records per table from an already advanced ijson parser"""
+        table_counts = {}
+        table_name = None
+        item_prefix = None
+        
+        for prefix, event, _ in parser:
+            # One start_map per record against one start_array per table: test the common case first
+            if event == 'start_map':
+                if prefix == item_prefix:
+                    table_counts[table_name] += 1
+            elif event == 'start_array' and prefix.startswith('tables.') and prefix.count('.') == 1:
+                table_name = prefix[len('tables.'):]
+                item_prefix = f"{prefix}.item"
+                table_counts[table_name] = 0
+        
+        return table_counts
+    
+    def _count_records_from_data(self, data) -> FileMetrics:
+        """
+        Count records from an already parsed document
+        
+        Accepts plain dicts (json.load fallback) and lazy simdjson objects; only
+        keys and lengths are read so simdjson never materializes the sample rows.
+        """
+        if 'tables' in data:
+            tables = data['tables']
+            return 'transformed', {name: len(tables[name]) for name in tables.keys()}, {}
+        
+        table_counts = {}
+        db_rollup = {}
+        for db_name in data.keys():
+            db_data = data[db_name]
+            if db_name == 'extraction_metadata' or not isinstance(db_data, JSON_OBJECT_TYPES):
+                continue
+            db_tables = db_records = 0
+            for table_name in db_data.keys():
+                table_info = db_data[table_name]
+                if isinstance(table_info, JSON_OBJECT_TYPES) and 'records' in table_info:
+                    table_counts[f"{db_name}.{table_name}"] = table_info['records']
+                    db_tables += 1
+                    db_records += table_info['records']
+            if db_tables:
+                db_rollup[db_name] = (db_tables, db_records)
+        
+        return 'extracted', table_counts, db_rollup
+    
     def _save_metrics(self):
-        """Save pipeline metrics to file"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        metrics_dir = Path(self.config.LOG_DIR)
-        metrics_file = metrics_dir / f"etl_metrics_{timestamp}.json"
+        """Save pipeline metrics to file, replacing the previous save atomically"""
+        if orjson is not None:
+            # orjson serializes datetimes natively; str() only covers leftovers such as Path
+            payload = orjson.dumps(self.metrics, default=str, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(self.metrics, indent=2, default=str).encode('utf-8')
+        
+        # Write beside the target and rename so a crash never leaves a truncated file
+        tmp_file = self.metrics_path.with_name(self.metrics_path.name + '.tmp')
+        tmp_file.write_bytes(payload)
+        os.replace(tmp_file, self.metrics_path)
         
-        with open(metrics_file, 'w') as f:
-            json.dump(self.metrics, f, indent=2, default=str)
+        self.logger.info(f"Metrics saved to {self.metrics_path}")
+    
+    def _load_metrics_if_resume(self, extracted_file: Path) -> bool:
+        """
+        Restore extraction metrics saved by the run that produced an extracted file
+        
+        Args:
+            extracted_file: Extracted file being reused because SKIP_EXTRACTION=true
+            
+        Returns:
+            True if extraction metrics were restored, False if the file must be scanned
+        """
+        if not settings.SKIP_EXTRACTION:
+            return False
+        
+        previous_runs = [
+            path for path in self.metrics_path.parent.glob("etl_metrics_*.json")
+            if path != self.metrics_path
+        ]
+        if not previous_runs:
+            return False
+        
+        latest_metrics = max(previous_runs, key=lambda p: p.stat().st_mtime)
+        try:
+            raw = latest_metrics.read_bytes()
+            previous = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            extraction = previous['extraction']
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Could not read previous metrics {latest_metrics}: {e}")
+            return False
+        
+        if not extraction.get('success') or extraction.get('output_file') != str(extracted_file):
+            return False
         
-        self.logger.info(f"Metrics saved to {metrics_file}")
+        self.metrics['extraction']['records_extracted'] = extraction['records_extracted']
+        self.metrics['extraction']['tables_extracted'] = extraction['tables_extracted']
+        self.metrics['extraction']['output_file'] = str(extracted_file)
+        self.logger.info(f"Restored extraction metrics from {latest_metrics}")
+        return True
 
 
 if __name__ == "__main__":
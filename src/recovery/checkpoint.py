@@ -6,12 +6,17 @@ resuming from the last successful point after failures.
 """
 
 import json
-import os
-from datetime import datetime
+import sqlite3
+import time
 from pathlib import Path
 from typing import Dict, Optional, Set
 import logging
 
+PHASES = ('extraction', 'transformation', 'loading')
+
+# Table categories recorded by mark_table_loaded / mark_table_failed / mark_table_skipped
+TABLE_CATEGORIES = ('loaded', 'failed', 'skipped')
+
 
 class ETLCheckpoint:
     """Manages ETL checkpoints for failure recovery"""
@@ -20,110 +25,164 @@ class ETLCheckpoint:
         self.job_id = job_id
         self.checkpoint_dir = Path(checkpoint_dir)
         self.checkpoint_dir.mkdir(exist_ok=True)
-        self.checkpoint_file = self.checkpoint_dir / f"{job_id}_checkpoint.json"
+        self.checkpoint_file = self.checkpoint_dir / f"{job_id}_checkpoint.db"
         self.logger = logging.getLogger(__name__)
         
+        # Each update is one small autocommitted B-tree write instead of a full file rewrite.
+        # WAL lets the recovery tool read while the pipeline writes; it needs a local filesystem.
+        self.connection = sqlite3.connect(str(self.checkpoint_file), isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA temp_store=MEMORY")
+        
         # Initialize or load checkpoint
-        self.checkpoint_data = self._load_checkpoint()
+        self._init_checkpoint()
     
-    def _load_checkpoint(self) -> Dict:
-        """Load existing checkpoint or create new one"""
-        if self.checkpoint_file.exists():
-            with open(self.checkpoint_file, 'r') as f:
-                return json.load(f)
+    def _init_checkpoint(self):
+        """Create the checkpoint tables and seed a new job"""
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS job (
+                key TEXT PRIMARY KEY,
+                value
+            );
+            CREATE TABLE IF NOT EXISTS phases (
+                name TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                details_json TEXT NOT NULL,
+                updated_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS tables (
+                category TEXT NOT NULL,
+                name TEXT NOT NULL,
+                meta_json TEXT NOT NULL,
+                ts REAL NOT NULL,
+                PRIMARY KEY (category, name)
+            );
+        """)
         
-        return {
-            'job_id': self.job_id,
-            'started_at': datetime.now().isoformat(),
-            'status': 'in_progress',
-            'phases': {
-                'extraction': {'status': 'pending', 'details': {}},
-                'transformation': {'status': 'pending', 'details': {}},
-                'loading': {'status': 'pending', 'details': {}}
-            },
-            'loaded_tables': [],
-            'failed_tables': [],
-            'skipped_tables': []
-        }
+        # Existing checkpoints keep their state
+        self.connection.execute(
+            "INSERT OR IGNORE INTO job (key, value) VALUES ('job_id', ?), ('started_at', ?), ('status', 'in_progress')",
+            (self.job_id, time.time())
+        )
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO phases (name, status, details_json) VALUES (?, 'pending', '{}')",
+            [(phase,) for phase in PHASES]
+        )
+    
+    def _set_job_fields(self, **fields):
+        """Set job-level fields (status, timestamps)"""
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO job (key, value) VALUES (?, ?)", fields.items()
+        )
     
-    def save(self):
-        """Save checkpoint to disk"""
-        with open(self.checkpoint_file, 'w') as f:
-            json.dump(self.checkpoint_data, f, indent=2)
+    def _get_job_field(self, key: str):
+        """Get a job-level field"""
+        row = self.connection.execute("SELECT value FROM job WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def save(self, durable: bool = False):
+        """
+        Make checkpoint updates durable
+        
+        Updates are committed as they are made; this only matters for durability.
+        
+        Args:
+            durable: Fold the write-ahead log into the checkpoint database
+        """
+        if durable:
+            self.connection.execute("PRAGMA wal_checkpoint(FULL)")
         self.logger.debug(f"Checkpoint saved: {self.checkpoint_file}")
     
     def update_phase(self, phase: str, status: str, details: Optional[Dict] = None):
         """Update phase status"""
-        self.checkpoint_data['phases'][phase]['status'] = status
+        now = time.time()
         if details:
-            self.checkpoint_data['phases'][phase]['details'].update(details)
-        self.checkpoint_data['last_updated'] = datetime.now().isoformat()
-        self.save()
+            (details_json,) = self.connection.execute(
+                "SELECT details_json FROM phases WHERE name = ?", (phase,)
+            ).fetchone()
+            merged_details = json.loads(details_json)
+            merged_details.update(details)
+            self.connection.execute(
+                "UPDATE phases SET status = ?, details_json = ?, updated_at = ? WHERE name = ?",
+                (status, json.dumps(merged_details, default=str), now, phase)
+            )
+        else:
+            self.connection.execute(
+                "UPDATE phases SET status = ?, updated_at = ? WHERE name = ?", (status, now, phase)
+            )
+        self._set_job_fields(last_updated=now)
+    
+    def _mark_table(self, category: str, table_name: str, meta: Dict):
+        """Record a table under a category, replacing any earlier entry for it"""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO tables (category, name, meta_json, ts) VALUES (?, ?, ?, ?)",
+            (category, table_name, json.dumps(meta), time.time())
+        )
     
     def mark_table_loaded(self, table_name: str, record_count: int):
         """Mark a table as successfully loaded"""
-        self.checkpoint_data['loaded_tables'].append({
-            'table': table_name,
-            'records': record_count,
-            'loaded_at': datetime.now().isoformat()
-        })
-        self.save()
+        self._mark_table('loaded', table_name, {'records': record_count})
     
     def mark_table_failed(self, table_name: str, error: str):
         """Mark a table as failed"""
-        self.checkpoint_data['failed_tables'].append({
-            'table': table_name,
-            'error': error,
-            'failed_at': datetime.now().isoformat()
-        })
-        self.save()
+        self._mark_table('failed', table_name, {'error': error})
     
     def mark_table_skipped(self, table_name: str, reason: str):
         """Mark a table as skipped"""
-        self.checkpoint_data['skipped_tables'].append({
-            'table': table_name,
-            'reason': reason,
-            'skipped_at': datetime.now().isoformat()
-        })
-        self.save()
+        self._mark_table('skipped', table_name, {'reason': reason})
+    
+    def _get_tables(self, category: str) -> Set[str]:
+        """Get the set of table names recorded under a category"""
+        return {
+            name for (name,) in self.connection.execute(
+                "SELECT name FROM tables WHERE category = ?", (category,)
+            )
+        }
     
     def get_loaded_tables(self) -> Set[str]:
         """Get set of successfully loaded table names"""
-        return {t['table'] for t in self.checkpoint_data['loaded_tables']}
+        return self._get_tables('loaded')
     
     def get_failed_tables(self) -> Set[str]:
         """Get set of failed table names"""
-        return {t['table'] for t in self.checkpoint_data['failed_tables']}
+        return self._get_tables('failed')
     
     def should_resume(self) -> bool:
         """Check if this job should be resumed"""
-        return (
-            self.checkpoint_data['status'] == 'in_progress' and
-            len(self.checkpoint_data['loaded_tables']) > 0
-        )
+        if self._get_job_field('status') != 'in_progress':
+            return False
+        return self.connection.execute(
+            "SELECT 1 FROM tables WHERE category = 'loaded' LIMIT 1"
+        ).fetchone() is not None
     
     def complete(self, success: bool = True):
         """Mark checkpoint as complete"""
-        self.checkpoint_data['status'] = 'completed' if success else 'failed'
-        self.checkpoint_data['completed_at'] = datetime.now().isoformat()
-        self.save()
+        self._set_job_fields(status='completed' if success else 'failed', completed_at=time.time())
+        self.save(durable=True)
     
     def get_summary(self) -> Dict:
         """Get checkpoint summary"""
+        table_counts = dict.fromkeys(TABLE_CATEGORIES, 0)
+        table_counts.update(self.connection.execute(
+            "SELECT category, COUNT(*) FROM tables GROUP BY category"
+        ))
         return {
             'job_id': self.job_id,
-            'status': self.checkpoint_data['status'],
-            'loaded_tables': len(self.checkpoint_data['loaded_tables']),
-            'failed_tables': len(self.checkpoint_data['failed_tables']),
-            'skipped_tables': len(self.checkpoint_data['skipped_tables']),
-            'phases': {
-                phase: data['status'] 
-                for phase, data in self.checkpoint_data['phases'].items()
-            }
+            'status': self._get_job_field('status'),
+            'loaded_tables': table_counts['loaded'],
+            'failed_tables': table_counts['failed'],
+            'skipped_tables': table_counts['skipped'],
+            'phases': dict(self.connection.execute("SELECT name, status FROM phases ORDER BY rowid"))
         }
     
     def cleanup(self):
         """Remove checkpoint file"""
-        if self.checkpoint_file.exists():
-            self.checkpoint_file.unlink()
-            self.logger.info(f"Checkpoint cleaned up: {self.checkpoint_file}")
+        self.connection.close()
+        # The write-ahead log and shared-memory index sit beside the database
+        for path in (self.checkpoint_file,
+                     self.checkpoint_file.with_name(self.checkpoint_file.name + '-wal'),
+                     self.checkpoint_file.with_name(self.checkpoint_file.name + '-shm')):
+            if path.exists():
+                path.unlink()
+        self.logger.info(f"Checkpoint cleaned up: {self.checkpoint_file}")
@@ -11,14 +11,43 @@ This tool helps recover from partial ETL failures by:
 import json
 import os
 import sys
-from datetime import datetime
+import tempfile
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import Any, BinaryIO, Iterator, List, Dict, Optional, Set, Tuple
 import logging
 
+try:
+    import ijson.backends.yajl2_c as ijson
+except ImportError:
+    try:
+        import ijson.backends.yajl2_cffi as ijson
+    except ImportError:
+        try:
+            import ijson
+        except ImportError:
+            ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# Uncompressed transformation files up to this size are parsed whole with simdjson, which
+# only materializes the records that are read, instead of walking every ijson event
+SIMDJSON_MAX_BYTES = 64 * 1024 * 1024
+
+# Write buffer for the recovery file, so per-table fragments reach the disk in large blocks
+RECOVERY_WRITE_BUFFER = 4 * 1024 * 1024
+
 from ..config import settings
 from ..loaders.loader import DataLoader
 from ..loaders.data_sources import SnowflakeDataSource, SQLiteDataSource
+from ..utils.memory_monitor import open_gzip_reader, open_plain_reader
 
 
 class ETLRecovery:
@@ -27,6 +56,7 @@ class ETLRecovery:
     def __init__(self):
         self.logger = self._setup_logging()
         self.settings = settings
+        self._first_records_cache = {}
     
     def _setup_logging(self) -> logging.Logger:
         """Setup logging for recovery process"""
@@ -42,58 +72,44 @@ class ETLRecovery:
         
         return logger
     
-    def get_loaded_tables(self) -> Set[str]:
-        """Get list of tables already loaded in the target database"""
-        self.logger.info(f"Checking loaded tables in {self.settings.DATA_STORE}...")
+    def get_loaded_tables(self, include_counts: bool = False) -> Set[str]:
+        """
+        Get list of tables already loaded in the target database
         
-        loaded_tables = set()
+        Args:
+            include_counts: Also count and report each table's rows (only needed for reporting)
+        
+        Returns:
+            Set of lowercased table names
+        """
+        self.logger.info(f"Checking loaded tables in {self.settings.DATA_STORE}...")
         
         if self.settings.DATA_STORE == 'snowflake':
             data_source = SnowflakeDataSource(self.settings.SNOWFLAKE_CONNECTION_URL)
-            try:
-                data_source.connect()
-                cursor = data_source.cursor
-                
-                # Get all tables in the current schema
-                cursor.execute("SHOW TABLES")
-                tables = cursor.fetchall()
-                
-                for table in tables:
-                    table_name = table[1]  # Table name is in second column
-                    loaded_tables.add(table_name.lower())
-                    
-                    # Get row count
-                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                    count = cursor.fetchone()[0]
-                    self.logger.info(f"  ✓ {table_name}: {count:,} records")
-                
-            finally:
-                data_source.disconnect()
-        
         elif self.settings.DATA_STORE == 'sqlite':
             data_source = SQLiteDataSource(self.settings.SQLITE_CONNECTION_URL)
-            try:
-                data_source.connect()
-                cursor = data_source.cursor
+        else:
+            return set()
                 
-                # Get all tables
-                cursor.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table'"
-                )
-                tables = cursor.fetchall()
+        try:
+            data_source.connect()
+            if not include_counts:
+                # Deciding what to skip only needs the table names
+                return {table_name.lower() for table_name in data_source.get_table_names()}
                 
-                for (table_name,) in tables:
-                    loaded_tables.add(table_name.lower())
+            # Snowflake reads ROW_COUNT metadata and SQLite runs one UNION ALL query,
+            # instead of one COUNT(*) round trip per table
+            row_counts = data_source.get_table_row_counts()
+        finally:
+            data_source.disconnect()
                     
-                    # Get row count
-                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                    count = cursor.fetchone()[0]
-                    self.logger.info(f"  ✓ {table_name}: {count:,} records")
+        # Emit the per-table report as one log record instead of one write per table
+        if row_counts:
+            self.logger.info("\n".join(
+                f"  ✓ {table_name}: {count:,} records" for table_name, count in row_counts.items()
+            ))
                     
-            finally:
-                data_source.disconnect()
-        
-        return loaded_tables
+        return {table_name.lower() for table_name in row_counts}
     
     def find_latest_transformation_file(self) -> Optional[str]:
         """Find the most recent transformation file"""
@@ -102,15 +118,20 @@ class ETLRecovery:
         if not transformation_dir.exists():
             return None
         
-        # Find all transformation files
-        files = list(transformation_dir.glob("snowflake_data_*.json"))
-        
-        if not files:
-            return None
-        
-        # Sort by modification time and return the latest
-        latest_file = max(files, key=lambda f: f.stat().st_mtime)
-        return str(latest_file)
+        # Track the newest file in one directory pass, statting each entry once. The
+        # <file>.meta.json sidecars share the prefix and are written last, so skip them
+        latest_file = None
+        latest_mtime = -1.0
+        with os.scandir(transformation_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if (name.startswith('snowflake_data_') and name.endswith('.json')
+                        and not name.endswith('.meta.json') and entry.is_file()):
+                    mtime = entry.stat().st_mtime
+                    if mtime > latest_mtime:
+                        latest_mtime, latest_file = mtime, entry.path
+        
+        return latest_file
     
     def recover_from_failure(
         self, 
@@ -138,77 +159,252 @@ class ETLRecovery:
         
         self.logger.info(f"Using transformation file: {transformation_file}")
         
-        # Load transformation data
-        with open(transformation_file, 'r') as f:
-            data = json.load(f)
-        
-        # Handle new format with etl_timestamp and tables
-        if 'tables' in data:
-            tables_data = data['tables']
-        else:
-            tables_data = data
-        
         # Get already loaded tables
         loaded_tables = self.get_loaded_tables()
         self.logger.info(f"\nFound {len(loaded_tables)} tables already loaded")
         
         # Determine which tables to load
-        skip_tables = set(skip_tables or [])
-        skip_tables = {t.lower() for t in skip_tables}  # Normalize to lowercase
+        skip_tables = {t.lower() for t in skip_tables or []}  # Normalize to lowercase
+        
+        # Stream tables into the recovery file one at a time, keeping only those to load
+        f, recovery_file, anonymous = self._open_recovery_file()
+        
+        dumps = orjson.dumps if orjson is not None else lambda obj: json.dumps(obj).encode('utf-8')
         
         tables_to_load = []
-        for table_name in tables_data.keys():
-            table_name_lower = table_name.lower()
+        already_loaded = []
+        user_skipped = []
             
-            if table_name_lower in loaded_tables:
-                self.logger.info(f"  → Skipping {table_name} (already loaded)")
-            elif table_name_lower in skip_tables:
-                self.logger.warning(f"  → Skipping {table_name} (in skip list)")
-            else:
+        # Lowercased table name -> list recording why it is skipped, so each table costs one lookup
+        skip_reasons = dict.fromkeys(skip_tables, user_skipped)
+        skip_reasons.update(dict.fromkeys(loaded_tables, already_loaded))
+        try:
+            f.write(b'{"tables":{')
+            for table_name, records in self._iter_tables(transformation_file):
+                skipped = skip_reasons.get(table_name.lower())
+                if skipped is not None:
+                    skipped.append(table_name)
+                    continue
+                
+                if tables_to_load:
+                    f.write(b',')
+                f.write(dumps(table_name))
+                f.write(b':')
+                f.write(dumps(records))
                 tables_to_load.append(table_name)
-                self.logger.info(f"  → Will load {table_name}")
+            f.write(b'}}')
+            f.flush()
+        except BaseException:
+            self._close_recovery_file(f, recovery_file, anonymous)
+            raise
+        
+        # One log line per category instead of one per table
+        if already_loaded:
+            self.logger.info(f"  → Skipping {len(already_loaded)} already loaded tables: {', '.join(already_loaded)}")
+        if user_skipped:
+            self.logger.warning(f"  → Skipping {len(user_skipped)} tables in skip list: {', '.join(user_skipped)}")
+        if tables_to_load:
+            self.logger.info(f"  → Will load {len(tables_to_load)} tables: {', '.join(tables_to_load)}")
         
         if not tables_to_load:
+            self._close_recovery_file(f, recovery_file, anonymous)
             self.logger.info("\nNo tables to load - recovery complete!")
             return True
         
-        # Create filtered data with only tables to load
-        filtered_data = {
-            table: tables_data[table] 
-            for table in tables_to_load
-        }
-        
-        # Save filtered data to temporary file
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        recovery_file = Path(self.settings.TRANSFORMED_OUTPUT_DIR) / f"recovery_data_{timestamp}.json"
-        
-        with open(recovery_file, 'w') as f:
-            json.dump(filtered_data, f, indent=2)
-        
         self.logger.info(f"\nCreated recovery file: {recovery_file}")
         self.logger.info(f"Loading {len(tables_to_load)} tables...")
         
         # Use DataLoader to load the filtered data
         try:
             loader = DataLoader()
-            success = loader.load(str(recovery_file))
+            result = loader.load(recovery_file)
             
-            if success:
+            if result:
                 self.logger.info("\n✅ Recovery completed successfully!")
             else:
                 self.logger.error("\n❌ Recovery failed!")
             
-            return success
+            return result.success
             
         except Exception as e:
             self.logger.error(f"\n❌ Recovery failed with error: {e}")
             return False
         
         finally:
-            # Optionally clean up recovery file
-            if recovery_file.exists():
-                recovery_file.unlink()
-                self.logger.info(f"Cleaned up recovery file")
+            self._close_recovery_file(f, recovery_file, anonymous)
+            self.logger.info(f"Cleaned up recovery file")
+    
+    def _open_recovery_file(self) -> Tuple[BinaryIO, str, bool]:
+        """
+        Open a temporary file for the filtered recovery data
+        
+        On Linux the file is an anonymous O_TMPFILE inode, reachable only through
+        /proc/self/fd while open, so it never needs a directory entry or an unlink.
+        
+        Returns:
+            Tuple of (open binary file, path the loader can read, whether the file is anonymous)
+        """
+        recovery_dir = self.settings.TRANSFORMED_OUTPUT_DIR
+        
+        if hasattr(os, 'O_TMPFILE'):
+            try:
+                fd = os.open(recovery_dir, os.O_RDWR | os.O_TMPFILE, 0o600)
+                return os.fdopen(fd, 'wb', buffering=RECOVERY_WRITE_BUFFER), f"/proc/self/fd/{fd}", True
+            except OSError:
+                # Filesystem without O_TMPFILE support - use a named temp file
+                pass
+        
+        f = tempfile.NamedTemporaryFile(
+            dir=recovery_dir, prefix='recovery_data_', suffix='.json',
+            delete=False, buffering=RECOVERY_WRITE_BUFFER
+        )
+        return f, f.name, False
+    
+    def _close_recovery_file(self, f: BinaryIO, recovery_file: str, anonymous: bool):
+        """Close the recovery file, removing it if it has a directory entry"""
+        f.close()
+        if not anonymous and os.path.exists(recovery_file):
+            os.unlink(recovery_file)
+    
+    @staticmethod
+    def _open_transformation_file(transformation_file: str) -> BinaryIO:
+        """Open a transformation file (optionally .gz compressed) for binary reads"""
+        if transformation_file.endswith('.gz'):
+            return open_gzip_reader(transformation_file)
+        return open_plain_reader(transformation_file)
+    
+    def _iter_tables(self, transformation_file: str) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Yield (table_name, records) pairs from a transformation file one table at a time
+        
+        Args:
+            transformation_file: Path to a transformation file (optionally .gz compressed)
+        
+        Returns:
+            Iterator over the file's tables; only one table's records are held in memory
+        """
+        if ijson is None:
+            with self._open_transformation_file(transformation_file) as f:
+                data = json.load(f)
+            yield from data.get('tables', data).items()
+            return
+        
+        with self._open_transformation_file(transformation_file) as f:
+            found = False
+            for table_name, records in ijson.kvitems(f, 'tables', use_float=True):
+                found = True
+                yield table_name, records
+        
+        if not found:
+            # Older files hold the tables at the top level without a 'tables' wrapper
+            with self._open_transformation_file(transformation_file) as f:
+                for table_name, records in ijson.kvitems(f, '', use_float=True):
+                    if isinstance(records, list):
+                        yield table_name, records
+    
+    def _get_first_records(self, transformation_file: str) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Get the first record of each table, re-reading the file only if it changed
+        
+        Args:
+            transformation_file: Path to a transformation file (optionally .gz compressed)
+        
+        Returns:
+            List of (table_name, first_record) pairs; first_record is None for empty tables
+        """
+        stat = os.stat(transformation_file)
+        cache_key = (transformation_file, stat.st_mtime_ns, stat.st_size)
+        if cache_key not in self._first_records_cache:
+            self._first_records_cache[cache_key] = list(self._iter_first_records(transformation_file))
+        return self._first_records_cache[cache_key]
+    
+    def _iter_first_records(self, transformation_file: str) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Yield (table_name, first_record) pairs from a transformation file without loading it
+        
+        Args:
+            transformation_file: Path to a transformation file (optionally .gz compressed)
+        
+        Returns:
+            Iterator over the file's tables; first_record is None for empty tables
+        """
+        if ijson is None:
+            with self._open_transformation_file(transformation_file) as f:
+                data = json.load(f)
+            for table_name, records in data.get('tables', data).items():
+                yield table_name, records[0] if records else None
+            return
+        
+        if (simdjson is not None and not transformation_file.endswith('.gz')
+                and os.path.getsize(transformation_file) < SIMDJSON_MAX_BYTES):
+            # The parser owns the document's memory, so it is kept alive while records are read
+            parser = simdjson.Parser()
+            try:
+                document = parser.parse(Path(transformation_file).read_bytes())
+            except ValueError:
+                # Not valid JSON for simdjson - let the streaming parser report it
+                document = None
+            if isinstance(document, simdjson.Object):
+                yield from self._first_records_from_document(document)
+                return
+        
+        with self._open_transformation_file(transformation_file) as f:
+            table_name = None
+            table_prefix = None
+            item_prefix = None
+            builder = None
+            
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is not None:
+                    # Build the first record only; later records are parsed but never materialized
+                    builder.event(event, value)
+                    if event == 'end_map' and prefix == item_prefix:
+                        yield table_name, builder.value
+                        builder = None
+                        table_name = None
+                elif table_name is not None:
+                    # Waiting for the table's first record (or its end, if it is empty)
+                    if event == 'start_map' and prefix == item_prefix:
+                        builder = ijson.common.ObjectBuilder()
+                        builder.event(event, value)
+                    elif event == 'end_array' and prefix == table_prefix:
+                        yield table_name, None
+                        table_name = None
+                elif event == 'start_array' and (
+                    (prefix.startswith('tables.') and prefix.count('.') == 1) or
+                    (prefix and '.' not in prefix)  # Older files without a 'tables' wrapper
+                ):
+                    # Every event after a table's first record lands here and is rejected by one compare
+                    table_name = prefix[len('tables.'):] if prefix.startswith('tables.') else prefix
+                    table_prefix = prefix
+                    item_prefix = f"{prefix}.item"
+    
+    @staticmethod
+    def _first_records_from_document(document) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Yield (table_name, first_record) pairs from a parsed simdjson document
+        
+        Matches the streaming parser: tables are the arrays under 'tables' and, for older
+        files, at the top level; a table's first record is its first object.
+        
+        Args:
+            document: Top-level simdjson object of a transformation file
+        
+        Returns:
+            Iterator over the file's tables; first_record is None for tables without objects
+        """
+        # Values are looked up by key: items() would convert every table to Python objects
+        for key in document.keys():
+            value = document[key]
+            if key == 'tables' and isinstance(value, simdjson.Object):
+                for table_name in value.keys():
+                    records = value[table_name]
+                    if isinstance(records, simdjson.Array):
+                        first_record = next((r for r in records if isinstance(r, simdjson.Object)), None)
+                        yield table_name, first_record.as_dict() if first_record is not None else None
+            elif isinstance(value, simdjson.Array):
+                first_record = next((r for r in value if isinstance(r, simdjson.Object)), None)
+                yield key, first_record.as_dict() if first_record is not None else None
     
     def validate_data_before_load(self, transformation_file: str) -> Dict[str, List[str]]:
         """
@@ -219,27 +415,16 @@ class ETLRecovery:
         """
         self.logger.info("Validating transformation data...")
         
-        with open(transformation_file, 'r') as f:
-            data = json.load(f)
-        
-        # Handle new format with etl_timestamp and tables
-        if 'tables' in data:
-            tables_data = data['tables']
-        else:
-            tables_data = data
-        
         issues = {}
         
-        for table_name, records in tables_data.items():
+        # Only the first record of each table is checked, so only that record is materialized
+        for table_name, sample_record in self._get_first_records(transformation_file):
             table_issues = []
             
-            if not records:
+            if sample_record is None:
                 table_issues.append("No records to load")
                 continue
             
-            # Check first record for structure
-            sample_record = records[0]
-            
             # Check for NULL values in likely required fields
             for field, value in sample_record.items():
                 if field.endswith('_id') and value is None:
@@ -266,7 +451,7 @@ def main():
     if len(sys.argv) > 1:
         if sys.argv[1] == 'check':
             # Just check what's loaded
-            recovery.get_loaded_tables()
+            recovery.get_loaded_tables(include_counts=True)
         
         elif sys.argv[1] == 'validate':
             # Validate transformation file
@@ -17,6 +17,8 @@ Usage:
 - Modify mappings as needed for new requirements
 """
 
+from collections import ChainMap
+
 # ===== IDENTITY SCHEMA MAPPINGS =====
 
 IDENTITY_MAPPINGS = {
@@ -503,10 +505,27 @@ TENANT_MAPPINGS = {
 
 # ===== COMBINED MAPPINGS =====
 
-ALL_MAPPINGS = {
-    **IDENTITY_MAPPINGS,
-    **MASTER_MAPPINGS,
-    **TENANT_MAPPINGS
+# A view over the schema mappings rather than a merged copy. ChainMap lookups take the first
+# match, so the schemas are listed in reverse: later schemas still win on duplicate names,
+# and iteration still yields identity, master, then tenant tables.
+ALL_MAPPINGS = ChainMap(TENANT_MAPPINGS, MASTER_MAPPINGS, IDENTITY_MAPPINGS)
+
+# ===== JOIN KEYS =====
+
+# Common join keys between source tables, based on table names
+JOIN_PATTERNS = {
+    ('users', 'user_preferences'): 'user_id',
+    ('users', 'user_accounts'): 'user_id',
+    ('user_accounts', 'users'): 'user_id',
+    ('user_preferences', 'users'): 'user_id',
+    ('organizations', 'organization_policy'): 'organization_id',
+    ('accounts', 'authentication_modules'): 'account_id',
+    ('accounts', 'smtp_configuration'): 'account_id',
+    ('tenants', 'subscriptions'): 'tenant_id',
+    ('tenants', 'billing_addresses'): 'tenant_id',
+    ('test_case', 'application_version'): 'application_id',
+    ('execution', 'execution_result'): 'execution_id',
+    ('test_case_group', 'application_version'): 'application_id'
 }
 
 # ===== UTILITY FUNCTIONS =====
@@ -6,17 +6,117 @@ Handles mapping from source tables to target tables based on
 transformation mappings.
 """
 
+import ast
 import json
 import os
 import math
-import gc
+import re
+import sys
+import tempfile
 from datetime import datetime
-from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Any, Optional
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 import logging
-from .transformation_mapping import ALL_MAPPINGS, get_source_tables, get_column_mappings, list_all_tables
-from ..utils.memory_monitor import MemoryMonitor
+
+import psutil
+
+# Prefer ijson's C tokenizer; the default backend may be pure Python
+try:
+    import ijson.backends.yajl2_c as ijson
+except ImportError:
+    try:
+        import ijson.backends.yajl2_cffi as ijson
+    except ImportError:
+        try:
+            import ijson
+        except ImportError:
+            ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .transformation_mapping import ALL_MAPPINGS, JOIN_PATTERNS, list_all_tables
+from ..config import settings
+from ..utils.memory_monitor import (
+    MemoryMonitor, open_gzip_reader, open_gzip_writer, open_plain_reader, relax_gc_for_bulk_processing
+)
+
+# Marks a column with no value for a record (None is a legitimate value)
+_MISSING = object()
+
+# Records serialized per write when appending to the streaming temp files
+JSONL_WRITE_BATCH = 1000
+
+# Bytes staged before each write when combining the temp files into the output file
+OUTPUT_STAGING_SIZE = 4 * 1024 * 1024
+
+# Buffer size for writing whole transformed JSON documents
+OUTPUT_WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Characters read per chunk when scanning a JSON file without ijson
+FALLBACK_SCAN_CHUNK_SIZE = 1024 * 1024
+
+# Characters that change the JSON structure state (string, escape or object depth)
+_JSON_STRUCTURE_CHARS = re.compile(r'["\\{}]')
+
+# Value types sanitize_value may change: floats (NaN/Infinity) and the containers that may hold them
+_SANITIZED_TYPES = frozenset({float, list, tuple, dict})
+
+# Prefix of a MySQL BLOB/BIT value written to the extracted JSON as str(bytes), e.g. "b'\\x01'"
+_BLOB_PREFIX = "b'\\x"
+
+# (table, column) pairs with column-specific cleaning, mapped to the DataTransformer method that
+# cleans them; every other value only needs a bytes check
+_SPECIAL_COLUMNS = {
+    ('dim_accounts', 'auth_enabled'): '_clean_boolean_blob',
+    ('fct_audit_events', 'tenant_id'): '_clean_required_tenant_id',
+}
+
+
+@lru_cache(maxsize=None)
+def _split_source_field(source_field: str) -> Tuple[Optional[str], str]:
+    """Split a "table.field" mapping into (table, interned field); direct fields have no table"""
+    if '.' not in source_field:
+        return None, source_field
+    table_name, field_name = source_field.split('.', 1)
+    return table_name, sys.intern(field_name)
+
+
+@lru_cache(maxsize=None)
+def _join_key(main_table: str, related_table: str) -> Optional[str]:
+    """Key joining two source tables in either direction (see JOIN_PATTERNS), or None"""
+    return JOIN_PATTERNS.get((main_table, related_table)) or JOIN_PATTERNS.get((related_table, main_table))
+
+
+@lru_cache(maxsize=None)
+def _compile_projection(source_fields: Tuple[Tuple[str, str], ...]) -> Callable[[Dict], Dict]:
+    """
+    Generate a function that projects a record onto a table's (target_column, field) pairs
+    
+    The function body is a single dict display with the column names as constants, so a
+    record is projected without iterating over the field plan. Like the plan itself it
+    raises KeyError for a record that lacks a field.
+    
+    Args:
+        source_fields: (target_column, source field name) pairs from _plan_source_fields
+    
+    Returns:
+        Function mapping a source record to a new target record
+    """
+    items = ', '.join(f'{target_column!r}: record[{field_name!r}]' for target_column, field_name in source_fields)
+    namespace = {}
+    exec(f'def project(record):\n    return {{{items}}}\n', namespace)
+    return namespace['project']
+
+
+@lru_cache(maxsize=1024)
+def _parse_blob_repr(text: str) -> bytes:
+    """Parse a BLOB/BIT value written as str(bytes); such columns hold few distinct values"""
+    return ast.literal_eval(text)
 
 
 class DataTransformer:
@@ -32,7 +132,6 @@ class DataTransformer:
         if config:
             self.config = config
         else:
-            from ..config import settings
             self.config = {
                 'workers': settings.TRANSFORMATION_WORKERS,
                 'output_dir': settings.TRANSFORMED_OUTPUT_DIR,
@@ -42,11 +141,27 @@ class DataTransformer:
         self.logger = logging.getLogger(__name__)
         self.target_tables = list_all_tables()
         
+        # Target tables that can be built from each source table, in mapping order, and the
+        # (target_column, field) pairs each source table supplies to them - parsed once here
+        # instead of splitting the column mappings for every call
+        self.targets_by_source = {}
+        self.source_field_plans = {}
+        for target_table, mapping in ALL_MAPPINGS.items():
+            column_mappings = mapping.get('column_mappings')
+            if mapping.get('source_tables') and column_mappings:
+                for source_table in mapping['source_tables']:
+                    self.targets_by_source.setdefault(source_table, []).append(target_table)
+                    self.source_field_plans[(source_table, target_table)] = self._plan_source_fields(
+                        source_table, column_mappings
+                    )
+        
+        # Cleaner for each column with its own rules, bound once so _clean_value dispatches
+        # with a single lookup
+        self.column_cleaners = {column: getattr(self, method) for column, method in _SPECIAL_COLUMNS.items()}
+        
         # Initialize memory monitor
-        from ..config import settings
         # Calculate actual memory limit based on system RAM percentage
         if settings.ENABLE_MEMORY_LIMIT:
-            import psutil
             total_ram_mb = psutil.virtual_memory().total / (1024 * 1024)
             memory_limit_mb = int(total_ram_mb * settings.MEMORY_LIMIT_PERCENT / 100)
         else:
@@ -90,12 +205,22 @@ class DataTransformer:
             records: List of records to sanitize
             
         Returns:
-            List of sanitized records
+            List of sanitized records; records without NaN, Infinity or nested
+            values are returned as they are rather than copied
         """
-        return [
-            {k: self.sanitize_value(v) for k, v in record.items()}
-            for record in records
-        ]
+        sanitize_value = self.sanitize_value
+        has_no_sanitized_types = _SANITIZED_TYPES.isdisjoint
+        sanitized = []
+        for record in records:
+            # Records of parsed JSON scalars are screened by their value types in one C-level
+            # pass; only records holding floats or nested values are checked value by value
+            if not has_no_sanitized_types(map(type, record.values())):
+                for value in record.values():
+                    if (isinstance(value, float) and not math.isfinite(value)) or isinstance(value, (list, tuple, dict)):
+                        record = {k: sanitize_value(v) for k, v in record.items()}
+                        break
+            sanitized.append(record)
+        return sanitized
     
     def transform_table_data(self, source_table: str, source_data: List[Dict]) -> Dict[str, List[Dict]]:
         """
@@ -111,10 +236,7 @@ class DataTransformer:
         transformed_data = {}
         
         # Find all target tables that use this source table
-        target_tables = []
-        for target_table, mapping in ALL_MAPPINGS.items():
-            if source_table in mapping.get('source_tables', []):
-                target_tables.append(target_table)
+        target_tables = self.targets_by_source.get(source_table)
         
         if not target_tables:
             self.logger.debug(f"No target tables found for source table: {source_table}")
@@ -122,29 +244,43 @@ class DataTransformer:
         
         # Transform data for each target table
         for target_table in target_tables:
-            mapping = ALL_MAPPINGS[target_table]
-            column_mappings = mapping.get('column_mappings', {})
-            
-            if not column_mappings:
+            source_fields = self.source_field_plans[(source_table, target_table)]
+            if not source_fields:
                 continue
+            
+            clean_value = self._clean_value
+            
+            # Columns with their own cleaning rules go through _clean_value for every record;
+            # otherwise only records that carry bytes values do
+            always_clean = any((target_table, target_column) in _SPECIAL_COLUMNS for target_column, _ in source_fields)
+            
+            # Extracted rows of a table share one column set: when the first record has every
+            # mapped field, records are projected without a membership test per field (a record
+            # that still lacks one falls back to the filtered projection)
+            fields_complete = bool(source_data) and all(field_name in source_data[0] for _, field_name in source_fields)
+            project = _compile_projection(source_fields)
                 
             # Transform records for this target table
             target_records = []
             for record in source_data:
                 try:
-                    transformed_record = {}
-                    
                     # Map columns from source to target
-                    for target_column, source_field in column_mappings.items():
-                        # Handle nested field references (e.g., "users.id")
-                        if '.' in source_field:
-                            table_name, field_name = source_field.split('.', 1)
-                            if table_name == source_table and field_name in record:
-                                value = record[field_name]
-                                transformed_record[target_column] = self._clean_value(value, target_column, target_table)
-                        elif source_field in record:
-                            value = record[source_field]
-                            transformed_record[target_column] = self._clean_value(value, target_column, target_table)
+                    transformed_record = None
+                    if fields_complete:
+                        try:
+                            transformed_record = project(record)
+                        except KeyError:
+                            pass
+                    if transformed_record is None:
+                        transformed_record = {
+                            target_column: record[field_name]
+                            for target_column, field_name in source_fields
+                            if field_name in record
+                        }
+                    if always_clean or bytes in map(type, transformed_record.values()):
+                        # Values are replaced in place; the record was built above and is not shared
+                        for target_column, value in transformed_record.items():
+                            transformed_record[target_column] = clean_value(value, target_column, target_table)
                     
                     # Only add record if it has some data
                     if transformed_record:
@@ -159,6 +295,28 @@ class DataTransformer:
         
         return transformed_data
     
+    @staticmethod
+    def _plan_source_fields(source_table: str, column_mappings: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+        """
+        Resolve the (target_column, field) pairs one source table supplies to a target table
+        
+        Mappings that reference other tables (e.g. "users.id" for another table) never match
+        and are left out.
+        
+        Args:
+            source_table: Source table name
+            column_mappings: Column mappings of the target table
+        
+        Returns:
+            Tuple of (target_column, source field name) pairs
+        """
+        source_fields = []
+        for target_column, source_field in column_mappings.items():
+            table_name, field_name = _split_source_field(source_field)
+            if table_name is None or table_name == source_table:
+                source_fields.append((target_column, field_name))
+        return tuple(source_fields)
+    
     def _clean_value(self, value: Any, column_name: str, table_name: str) -> Any:
         """
         Clean and convert values for Snowflake compatibility
@@ -171,24 +329,12 @@ class DataTransformer:
         Returns:
             Cleaned value for Snowflake
         """
-        # Handle MySQL TINYINT(1) boolean conversion
-        if column_name == 'auth_enabled' and table_name == 'dim_accounts':
-            if isinstance(value, bytes):
-                # Convert byte string to boolean
-                return bool(int.from_bytes(value, byteorder='big'))
-            elif value is not None:
-                return bool(value)
-            return None
-        
-        # Handle NULL values for non-nullable columns
-        if column_name == 'tenant_id' and table_name == 'fct_audit_events':
-            if value is None:
-                # Use a default tenant_id of 0 for NULL values
-                self.logger.warning(f"NULL tenant_id found for {table_name}, using default value 0")
-                return 0
+        column_cleaner = self.column_cleaners.get((table_name, column_name))
+        if column_cleaner is not None:
+            return column_cleaner(value, table_name)
         
         # Handle other byte string conversions
-        if isinstance(value, bytes):
+        if type(value) is bytes:
             try:
                 # Try to decode as UTF-8 string
                 return value.decode('utf-8')
@@ -198,6 +344,30 @@ class DataTransformer:
         
         return value
     
+    def _clean_boolean_blob(self, value: Any, table_name: str) -> Optional[bool]:
+        """Convert a MySQL TINYINT(1)/BIT(1) value, possibly serialized as str(bytes), to a boolean"""
+        if type(value) is str and value[:4] == _BLOB_PREFIX:
+            # Bytes serialized by the extractor's str() fallback
+            try:
+                value = _parse_blob_repr(value)
+            except (ValueError, SyntaxError):
+                # Only looks like a bytes repr; treat it like any other non-empty value
+                return bool(value)
+        if isinstance(value, bytes):
+            # Convert byte string to boolean
+            return bool(int.from_bytes(value, byteorder='big'))
+        elif value is not None:
+            return bool(value)
+        return None
+    
+    def _clean_required_tenant_id(self, value: Any, table_name: str) -> Any:
+        """Replace a NULL tenant_id, which the target column does not allow, with 0"""
+        if value is None:
+            # Use a default tenant_id of 0 for NULL values
+            self.logger.warning(f"NULL tenant_id found for {table_name}, using default value 0")
+            return 0
+        return value
+    
     def transform_database_data(self, database: str, database_data: Dict) -> Dict[str, List[Dict]]:
         """
         Transform all tables from a database with proper table joins
@@ -211,15 +381,22 @@ class DataTransformer:
         """
         all_transformed_data = {table: [] for table in self.target_tables}
         
+        # Join indexes are shared by the target tables built from this database (see _join_source_tables)
+        join_indexes = {}
+        
+        # Only target tables fed by a source table with sample data in this database can be built
+        buildable_targets = {}
+        for source_table, table_info in database_data.items():
+            if isinstance(table_info, dict) and table_info.get('sample'):
+                for target_table in self.targets_by_source.get(source_table, ()):
+                    buildable_targets[target_table] = ALL_MAPPINGS[target_table]
+        
         # Process each target table by joining its source tables
-        for target_table, mapping in ALL_MAPPINGS.items():
-            source_tables = mapping.get('source_tables', [])
-            column_mappings = mapping.get('column_mappings', {})
+        for target_table, mapping in buildable_targets.items():
+            source_tables = mapping['source_tables']
+            column_mappings = mapping['column_mappings']
             primary_key = mapping.get('primary_key')
             
-            if not source_tables or not column_mappings:
-                continue
-            
             # Check if all required source tables are available in this database
             available_tables = {}
             for source_table in source_tables:
@@ -234,7 +411,9 @@ class DataTransformer:
                 continue
             
             # Join tables and create consolidated records
-            joined_records = self._join_source_tables(target_table, available_tables, column_mappings, primary_key)
+            joined_records = self._join_source_tables(
+                target_table, available_tables, column_mappings, primary_key, join_indexes
+            )
             
             if joined_records:
                 all_transformed_data[target_table] = joined_records
@@ -243,7 +422,8 @@ class DataTransformer:
         return all_transformed_data
     
     def _join_source_tables(self, target_table: str, available_tables: Dict[str, List[Dict]], 
-                           column_mappings: Dict[str, str], primary_key: str) -> List[Dict]:
+                           column_mappings: Dict[str, str], primary_key: str,
+                           join_indexes: Optional[Dict[Tuple[str, Optional[str]], Tuple]] = None) -> List[Dict]:
         """
         Join multiple source tables to create consolidated records for a target table
         
@@ -252,6 +432,8 @@ class DataTransformer:
             available_tables: Dictionary of source table data
             column_mappings: Column mappings from source to target
             primary_key: Primary key column name
+            join_indexes: Optional cache of related table indexes by (table, join key),
+                reused across target tables built from the same source data
             
         Returns:
             List of consolidated records
@@ -260,63 +442,54 @@ class DataTransformer:
             return []
         
         # Find the main table (usually the one with the primary key)
-        main_table = None
-        main_table_data = None
-        
-        for source_table, source_data in available_tables.items():
-            # Check if this table contains the primary key field
-            # Handle both single primary key and composite keys
-            if isinstance(primary_key, list):
-                # For composite keys, use the first key
-                pk_to_check = primary_key[0]
-            else:
-                pk_to_check = primary_key
-                
-            primary_key_mapping = column_mappings.get(pk_to_check, "")
-            if source_data and '.' in primary_key_mapping:
-                # Extract the table name from the primary key mapping
-                table_name = primary_key_mapping.split('.')[0]
-                if table_name == source_table:
-                    main_table = source_table
-                    main_table_data = source_data
-                    break
+        # Handle both single primary key and composite keys - for composite keys, use the first key
+        pk_to_check = primary_key[0] if isinstance(primary_key, list) else primary_key
+        primary_key_mapping = column_mappings.get(pk_to_check, "")
+        main_table = _split_source_field(primary_key_mapping)[0]
         
         # If no main table found, use the first available table
-        if not main_table:
-            main_table = list(available_tables.keys())[0]
-            main_table_data = available_tables[main_table]
+        if not available_tables.get(main_table):
+            main_table = next(iter(available_tables))
+        main_table_data = available_tables[main_table]
+        
+        # Index each related table by its join key once, instead of scanning it per main record;
+        # a table joined on the same key for another target table reuses that index
+        if join_indexes is None:
+            join_indexes = {}
+        related_indexes = {}
+        for table_name, table_data in available_tables.items():
+            index_key = (table_name, _join_key(main_table, table_name))
+            if index_key not in join_indexes:
+                join_indexes[index_key] = self._index_related_table(main_table, table_name, table_data)
+            related_indexes[table_name] = join_indexes[index_key]
+        
+        # Specialize one getter per target column for this join, so the per-record loop
+        # no longer re-decides where each column comes from
+        column_getters = self._build_column_getters(main_table, available_tables, related_indexes, column_mappings)
+        
+        clean_value = self._clean_value
+        always_clean = any((target_table, target_column) in _SPECIAL_COLUMNS for target_column, _ in column_getters)
         
         # Create consolidated records
         consolidated_records = []
         
+        # Related record per source table, looked up once per main record; one dict is
+        # cleared and reused rather than allocating a new one for every record
+        related_records = {}
+        
         for main_record in main_table_data:
             try:
-                consolidated_record = {}
+                related_records.clear()
                 
                 # Map all columns from all source tables
-                for target_column, source_field in column_mappings.items():
-                    if '.' in source_field:
-                        table_name, field_name = source_field.split('.', 1)
-                        
-                        # Get data from the appropriate source table
-                        if table_name == main_table and field_name in main_record:
-                            value = main_record[field_name]
-                            consolidated_record[target_column] = self._clean_value(value, target_column, target_table)
-                        elif table_name in available_tables:
-                            # Find related record in other table
-                            related_record = self._find_related_record(
-                                main_record, main_table, 
-                                available_tables[table_name], table_name, 
-                                target_column, source_field
-                            )
-                            if related_record and field_name in related_record:
-                                value = related_record[field_name]
-                                consolidated_record[target_column] = self._clean_value(value, target_column, target_table)
-                    else:
-                        # Direct field mapping
-                        if source_field in main_record:
-                            value = main_record[source_field]
-                            consolidated_record[target_column] = self._clean_value(value, target_column, target_table)
+                consolidated_record = {}
+                for target_column, getter in column_getters:
+                    value = getter(main_record, related_records)
+                    if value is not _MISSING:
+                        consolidated_record[target_column] = value
+                if always_clean or bytes in map(type, consolidated_record.values()):
+                    for target_column, value in consolidated_record.items():
+                        consolidated_record[target_column] = clean_value(value, target_column, target_table)
                 
                 # Only add record if it has meaningful data
                 if consolidated_record and any(v is not None and v != "" for v in consolidated_record.values()):
@@ -328,86 +501,135 @@ class DataTransformer:
         
         return consolidated_records
     
-    def _find_related_record(self, main_record: Dict, main_table: str, 
-                           related_data: List[Dict], related_table: str,
-                           target_column: str, source_field: str) -> Optional[Dict]:
+    def _build_column_getters(self, main_table: str, available_tables: Dict[str, List[Dict]],
+                              related_indexes: Dict[str, Tuple[Optional[str], Dict[Any, Dict]]],
+                              column_mappings: Dict[str, str]) -> List[Tuple[str, Callable]]:
+        """
+        Build a getter per target column that reads its value for one main record
+        
+        Mappings are resolved once here: columns whose source table is unavailable
+        are dropped, and each getter is bound to its table, field and join index.
+        
+        Args:
+            main_table: Name of the main table
+            available_tables: Dictionary of source table data
+            related_indexes: Join key and index per source table (see _index_related_table)
+            column_mappings: Column mappings from source to target
+        
+        Returns:
+            List of (target_column, getter) pairs; getter(main_record, related_records)
+            returns the value or _MISSING
+        """
+        find_related_record = self._find_related_record
+        
+        def related_getter(table_name, field_name):
+            related_data = available_tables[table_name]
+            join_key, related_index = related_indexes[table_name]
+            
+            def get_related(main_record, related_records):
+                # One probe of the per-record cache; the join index itself is bound above
+                related_record = related_records.get(table_name, _MISSING)
+                if related_record is _MISSING:
+                    related_record = related_records[table_name] = find_related_record(
+                        main_record, related_data, join_key, related_index
+                    )
+                if related_record and field_name in related_record:
+                    return related_record[field_name]
+                return _MISSING
+            return get_related
+        
+        def main_getter(field_name, fallback):
+            def get_main(main_record, related_records):
+                if field_name in main_record:
+                    return main_record[field_name]
+                return fallback(main_record, related_records) if fallback else _MISSING
+            return get_main
+        
+        column_getters = []
+        for target_column, source_field in column_mappings.items():
+            # Mappings are split once per distinct string, not on every join
+            table_name, field_name = _split_source_field(source_field)
+            if table_name is None:
+                # Direct field mapping
+                column_getters.append((target_column, main_getter(field_name, None)))
+                continue
+            
+            if table_name not in available_tables:
+                continue
+            if table_name == main_table:
+                # Fields missing from the main record fall back to a lookup like any related table
+                column_getters.append((target_column, main_getter(field_name, related_getter(table_name, field_name))))
+            else:
+                column_getters.append((target_column, related_getter(table_name, field_name)))
+        
+        return column_getters
+    
+    def _index_related_table(self, main_table: str, related_table: str,
+                             related_data: List[Dict]) -> Tuple[Optional[str], Dict[Any, Dict]]:
+        """
+        Index a related table's records by the key that joins it to the main table
+        
+        Args:
+            main_table: Name of the main table
+            related_table: Name of the related table
+            related_data: Data from the related table
+        
+        Returns:
+            Tuple of (join key or None, mapping of join key value to first matching record)
+        """
+        join_key = _join_key(main_table, related_table)
+        
+        related_index = {}
+        if join_key:
+            for related_record in related_data:
+                if join_key in related_record:
+                    try:
+                        # Keep the first record per key, matching the original linear scan
+                        related_index.setdefault(related_record[join_key], related_record)
+                    except TypeError:
+                        # Unhashable key values can never be looked up
+                        continue
+        
+        return join_key, related_index
+    
+    def _find_related_record(self, main_record: Dict, related_data: List[Dict],
+                             join_key: Optional[str], related_index: Dict[Any, Dict]) -> Optional[Dict]:
         """
         Find a related record in another table based on common keys
         
         Args:
             main_record: Record from the main table
-            main_table: Name of the main table
             related_data: Data from the related table
-            related_table: Name of the related table
-            target_column: Target column name
-            source_field: Source field mapping
+            join_key: Key joining the two tables, or None if no join pattern is known
+            related_index: Related records indexed by join key value (see _index_related_table)
             
         Returns:
             Related record if found, None otherwise
         """
-        # For now, use simple heuristics to find related records
-        # This can be enhanced with proper foreign key relationships
-        
-        # Common join patterns based on table names
-        join_patterns = {
-            ('users', 'user_preferences'): 'user_id',
-            ('users', 'user_accounts'): 'user_id',
-            ('user_accounts', 'users'): 'user_id',
-            ('user_preferences', 'users'): 'user_id',
-            ('organizations', 'organization_policy'): 'organization_id',
-            ('accounts', 'authentication_modules'): 'account_id',
-            ('accounts', 'smtp_configuration'): 'account_id',
-            ('tenants', 'subscriptions'): 'tenant_id',
-            ('tenants', 'billing_addresses'): 'tenant_id',
-            ('test_case', 'application_version'): 'application_id',
-            ('execution', 'execution_result'): 'execution_id',
-            ('test_case_group', 'application_version'): 'application_id'
-        }
-        
-        # Try to find a common key
-        join_key = join_patterns.get((main_table, related_table))
-        if not join_key:
-            join_key = join_patterns.get((related_table, main_table))
-        
         if join_key and join_key in main_record:
-            main_key_value = main_record[join_key]
-            
-            # Find matching record in related table
-            for related_record in related_data:
-                if join_key in related_record and related_record[join_key] == main_key_value:
-                    return related_record
+            try:
+                related_record = related_index.get(main_record[join_key])
+            except TypeError:
+                related_record = None
+            if related_record is not None:
+                return related_record
         
         # If no specific join pattern, return the first record (simple approach)
         return related_data[0] if related_data else None
     
-    def transform_file(self, filepath: str, etl_id: Optional[str] = None) -> str:
+    def transform_extracted_data(self, extracted_data: Dict) -> Dict[str, List[Dict]]:
         """
-        Transform data from an extracted file using streaming to handle large files
+        Transform extracted data that is already in memory
+        
+        Callers holding the parsed extraction output use this directly instead of
+        writing it to disk for transform_file to read back.
         
         Args:
-            filepath: Path to extracted data file
-            etl_id: Optional ETL run ID for organizing output files
+            extracted_data: Parsed extraction output (multi-database or single table format)
             
         Returns:
-            Path to transformed data file
+            Dictionary mapping target table names to transformed records
         """
-        self.logger.info(f"Transforming file: {filepath}")
-        
-        # Check file size to warn about large files
-        import os
-        file_size_mb = os.path.getsize(filepath) / (1024 * 1024)
-        self.logger.info(f"File size: {file_size_mb:.2f} MB")
-        
-        # For very large files, use streaming approach
-        if file_size_mb > 100:  # If file is larger than 100MB
-            self.logger.info("Large file detected - using streaming transformation")
-            return self._transform_file_streaming(filepath, etl_id)
-        
-        # For smaller files, use the original approach
-        with open(filepath, 'r') as f:
-            extracted_data = json.load(f)
-        
-        # Initialize transformed data structure
         all_transformed_data = {table: [] for table in self.target_tables}
         
         # Process data based on file structure
@@ -436,6 +658,35 @@ class DataTransformer:
                     for table, records in transformed_data.items():
                         all_transformed_data[table].extend(records)
         
+        return all_transformed_data
+    
+    def transform_file(self, filepath: str, etl_id: Optional[str] = None) -> str:
+        """
+        Transform data from an extracted file using streaming to handle large files
+        
+        Args:
+            filepath: Path to extracted data file
+            etl_id: Optional ETL run ID for organizing output files
+        
+        Returns:
+            Path to transformed data file
+        """
+        self.logger.info(f"Transforming file: {filepath}")
+        
+        # Check file size to warn about large files
+        file_size_mb = os.path.getsize(filepath) / (1024 * 1024)
+        self.logger.info(f"File size: {file_size_mb:.2f} MB")
+        
+        # For very large files, use streaming approach
+        if file_size_mb > 100:  # If file is larger than 100MB
+            self.logger.info("Large file detected - using streaming transformation")
+            return self._transform_file_streaming(filepath, etl_id)
+        
+        # For smaller files, use the original approach
+        extracted_data = self._load_json_file(filepath)
+        
+        all_transformed_data = self.transform_extracted_data(extracted_data)
+        
         # Sanitize all transformed data to ensure JSON compatibility
         sanitized_tables = {}
         for table_name, records in all_transformed_data.items():
@@ -444,14 +695,17 @@ class DataTransformer:
             else:
                 sanitized_tables[table_name] = records
         
+        # One timestamp for both the header and the file name
+        run_time = datetime.now()
+        
         # Create output data structure
         output_data = {
-            'etl_timestamp': datetime.now().isoformat(),
+            'etl_timestamp': run_time.isoformat(),
             'tables': sanitized_tables
         }
         
         # Save transformed data
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = run_time.strftime("%Y%m%d_%H%M%S")
         
         # Create ETL-specific directory if etl_id is provided
         if etl_id:
@@ -463,8 +717,8 @@ class DataTransformer:
         output_filename = f"snowflake_data_{timestamp}.json"
         output_path = os.path.join(output_dir, output_filename)
         
-        with open(output_path, 'w') as f:
-            json.dump(output_data, f, indent=2, default=str, ensure_ascii=False)
+        self._write_json_output(output_path, output_data)
+        self._write_metadata_sidecar(output_path, {table: len(records) for table, records in sanitized_tables.items()})
         
         # Log summary
         total_records = sum(len(records) for records in sanitized_tables.values())
@@ -491,10 +745,14 @@ class DataTransformer:
         all_transformed_data = {table: [] for table in self.target_tables}
         
         if self.config.get('enable_concurrent', True):
-            # Process files in parallel
-            with ThreadPoolExecutor(max_workers=self.config.get('workers', 4)) as executor:
+            # Process files in parallel; transformation is CPU-bound Python, so worker
+            # processes (each with its own transformer) scale where threads hold the GIL
+            with ProcessPoolExecutor(
+                max_workers=self.config.get('workers', 4),
+                initializer=_init_transform_worker, initargs=(self.config,)
+            ) as executor:
                 future_to_file = {
-                    executor.submit(self._process_file_for_parallel, filepath): filepath
+                    executor.submit(_transform_file_in_worker, filepath): filepath
                     for filepath in filepaths
                 }
                 
@@ -530,22 +788,122 @@ class DataTransformer:
             else:
                 sanitized_tables[table_name] = records
         
+        # One timestamp for both the header and the file name
+        run_time = datetime.now()
+        
         # Create output data structure
         output_data = {
-            'etl_timestamp': datetime.now().isoformat(),
+            'etl_timestamp': run_time.isoformat(),
             'tables': sanitized_tables
         }
         
         # Save consolidated transformed data
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = run_time.strftime("%Y%m%d_%H%M%S")
         output_filename = f"snowflake_data_{timestamp}.json"
         output_path = os.path.join(self.config['output_dir'], output_filename)
         
-        with open(output_path, 'w') as f:
-            json.dump(output_data, f, indent=2, default=str, ensure_ascii=False)
+        self._write_json_output(output_path, output_data)
+        self._write_metadata_sidecar(output_path, {table: len(records) for table, records in sanitized_tables.items()})
         
         return output_path
     
+    @staticmethod
+    def _encode_jsonl(records: List[Dict]) -> bytes:
+        """
+        Serialize records as newline-terminated JSON lines
+        
+        Args:
+            records: Records to serialize
+        
+        Returns:
+            UTF-8 encoded JSON lines
+        """
+        if orjson is not None:
+            # orjson handles datetimes natively; str() only covers leftovers such as Decimal
+            lines = [orjson.dumps(record, default=str) for record in records]
+        else:
+            lines = [json.dumps(record, default=str, ensure_ascii=False).encode('utf-8') for record in records]
+        lines.append(b'')
+        return b'\n'.join(lines)
+    
+    @staticmethod
+    def _load_json_file(filepath: str) -> Any:
+        """
+        Parse a whole JSON data file (optionally .gz compressed)
+        
+        The file is read as bytes through a large buffer and parsed with orjson when
+        installed; documents orjson rejects (e.g. NaN or integers beyond 64 bits) are
+        parsed by json instead.
+        
+        Args:
+            filepath: Path to the JSON file
+        
+        Returns:
+            Parsed document
+        """
+        opener = open_gzip_reader if filepath.endswith('.gz') else open_plain_reader
+        with opener(filepath) as f:
+            data = f.read()
+        if orjson is not None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(data)
+    
+    @staticmethod
+    def _write_json_output(output_path: str, output_data: Dict):
+        """
+        Write a transformed data document as indented JSON
+        
+        The document is serialized in one call and written as bytes through a
+        1 MiB buffer instead of being encoded piecewise by a text-mode file.
+        
+        Args:
+            output_path: Path of the JSON file to write
+            output_data: Document to serialize
+        """
+        if orjson is not None:
+            payload = orjson.dumps(output_data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(output_data, indent=2, default=str, ensure_ascii=False).encode('utf-8')
+        with open(output_path, 'wb', buffering=OUTPUT_WRITE_BUFFER_SIZE) as f:
+            f.write(payload)
+    
+    def _count_databases_from_sidecar(self, filepath: str) -> Optional[int]:
+        """
+        Read the number of databases from the <file>.meta.json sidecar written by the extractor
+        
+        Args:
+            filepath: Path to the extracted data file
+        
+        Returns:
+            Number of databases, or None if no up-to-date sidecar exists
+        """
+        meta_path = f"{filepath}.meta.json"
+        try:
+            # Ignore sidecars that predate the data file they describe
+            if os.path.getmtime(meta_path) < os.path.getmtime(filepath):
+                return None
+            with open(meta_path, 'r') as f:
+                return len(json.load(f)['databases'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def _write_metadata_sidecar(self, output_path: str, table_counts: Dict[str, int]):
+        """
+        Write per-table record counts next to the output file
+        
+        Consumers such as the pipeline metrics read <file>.meta.json instead of
+        re-parsing the (potentially multi-GB) transformed file.
+        
+        Args:
+            output_path: Path to the transformed data file
+            table_counts: Dictionary mapping table name to record count
+        """
+        with open(f"{output_path}.meta.json", 'w') as f:
+            json.dump({'type': 'transformed', 'tables': table_counts, 'total': sum(table_counts.values())}, f)
+    
     def _process_file_for_parallel(self, filepath: str) -> Dict[str, List[Dict]]:
         """
         Process a single file for parallel transformation
@@ -557,37 +915,11 @@ class DataTransformer:
             Dictionary of transformed data
         """
         # Load extracted data
-        with open(filepath, 'r') as f:
-            extracted_data = json.load(f)
-        
-        # Initialize result
-        result = {table: [] for table in self.target_tables}
+        extracted_data = self._load_json_file(filepath)
         
-        # Process data based on file structure
-        if isinstance(extracted_data, dict):
-            # Check if it's a multi-database format
-            if all(isinstance(v, dict) for v in extracted_data.values()):
-                # Multi-database format
-                for database, database_data in extracted_data.items():
-                    transformed_data = self.transform_database_data(database, database_data)
-                    
-                    # Merge transformed data
-                    for table, records in transformed_data.items():
-                        result[table].extend(records)
-            else:
-                # Single table format
-                table_name = extracted_data.get('table')
-                source_data = extracted_data.get('data', [])
-                
-                if table_name and source_data:
-                    transformed_data = self.transform_table_data(table_name, source_data)
-                    
-                    # Merge transformed data
-                    for table, records in transformed_data.items():
-                        result[table].extend(records)
-        
-        return result
+        return self.transform_extracted_data(extracted_data)
     
+    @relax_gc_for_bulk_processing()
     def _transform_file_streaming(self, filepath: str, etl_id: Optional[str] = None) -> str:
         """
         Transform a large file using streaming to avoid memory issues
@@ -602,14 +934,12 @@ class DataTransformer:
         Returns:
             Path to transformed data file
         """
-        import gc
-        try:
-            import ijson
-        except ImportError:
+        if ijson is None:
             self.logger.warning("ijson not available, using fallback streaming method")
             return self._transform_file_streaming_fallback(filepath, etl_id)
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        run_time = datetime.now()
+        timestamp = run_time.strftime("%Y%m%d_%H%M%S")
         
         # Create ETL-specific directory if etl_id is provided
         if etl_id:
@@ -621,179 +951,180 @@ class DataTransformer:
         output_filename = f"snowflake_data_{timestamp}.json"
         output_path = os.path.join(output_dir, output_filename)
         
-        # Initialize progress tracking
+        # Initialize progress tracking. Imported here because progress_tracker pulls in the
+        # notifications module (and requests), which only ETL runs with an etl_id need
         from ..utils.progress_tracker import ProgressTracker
         tracker = ProgressTracker(etl_id) if etl_id else None
         
-        # First pass: count databases for progress tracking
-        self.logger.info("Analyzing file structure...")
-        database_count = 0
-        with open(filepath, 'rb') as f:
-            parser = ijson.parse(f)
-            for prefix, event, value in parser:
-                if event == 'map_key' and not prefix:
-                    # Top-level key (database name)
-                    if value != 'extraction_metadata' and not value.startswith('_'):
-                        database_count += 1
-        
-        self.logger.info(f"Found {database_count} databases to process")
+        # The database count for progress tracking comes from the extractor's sidecar
+        # rather than a separate parse of the whole input file
+        database_count = self._count_databases_from_sidecar(filepath)
+        if database_count is not None:
+            self.logger.info(f"Found {database_count} databases to process")
         
         if tracker:
-            tracker.start_phase("Transformation", database_count)
-        
-        # Initialize output file
-        with open(output_path, 'w') as out_f:
-            out_f.write('{\n')
-            out_f.write(f'  "etl_timestamp": "{datetime.now().isoformat()}",\n')
-            out_f.write('  "tables": {\n')
+            tracker.start_phase("Transformation", database_count or 0)
         
         # Use compressed output for better performance
-        import gzip
         use_compression = True
         if use_compression:
             output_path = output_path.replace('.json', '.json.gz')
             self.logger.info(f"Using gzip compression for output: {output_path}")
         
         # Create temporary files for each table to avoid memory buildup
-        import tempfile
         temp_dir = tempfile.mkdtemp(prefix='etl_transform_')
         self.logger.info(f"Using temporary directory: {temp_dir}")
         
         # Track which tables have data
         tables_with_data = set()
         temp_files = {}
+        table_record_counts = {}
         
         # Second pass: process each database and write immediately
         processed_databases = 0
         total_records = 0
         
-        with open(filepath, 'rb') as f:
-            parser = ijson.parse(f)
-            current_database = None
-            current_table = None
-            database_data = {}
+        def write_transformed(current_database: str, transformed_data: Dict[str, List[Dict]]):
+            """Append one database's transformed records to the per-table temp files"""
+            nonlocal processed_databases, total_records
             
-            for prefix, event, value in parser:
-                if event == 'map_key' and not prefix:
-                    # Top-level key (database name)
-                    if value != 'extraction_metadata' and not value.startswith('_'):
-                        # Process previous database if exists
-                        if current_database and database_data:
-                            self.logger.info(f"[{processed_databases+1}/{database_count}] Processing {current_database}")
-                            
-                            # Check memory
-                            self.memory_monitor.check_memory(f"before transforming {current_database}")
-                            
-                            # Transform the database data
-                            transformed_data = self.transform_database_data(current_database, database_data)
-                            
-                            # Write transformed data to temporary files immediately
-                            for table, records in transformed_data.items():
-                                if records:
-                                    if table not in temp_files:
-                                        # Create new temp file for this table
-                                        temp_file = os.path.join(temp_dir, f"{table}.jsonl")
-                                        temp_files[table] = temp_file
-                                        tables_with_data.add(table)
-                                    
-                                    # Append records to temp file (JSONL format for streaming)
-                                    with open(temp_files[table], 'a') as tf:
-                                        for record in records:
-                                            json.dump(record, tf, default=str, ensure_ascii=False)
-                                            tf.write('\n')
-                                    
-                                    total_records += len(records)
-                            
-                            # Free memory immediately
-                            database_data.clear()
-                            del transformed_data
-                            gc.collect()
-                            
-                            processed_databases += 1
-                            if tracker:
-                                tracker.update_progress(1)
-                            
-                            self.memory_monitor.log_memory_status(f"After transforming {current_database}")
-                        
-                        # Start new database
-                        current_database = value
-                        database_data = {}
-                
-                elif event == 'map_key' and prefix == current_database:
-                    # Table name within database
-                    current_table = value
-                    database_data[current_table] = []
-                
-                elif prefix and prefix.startswith(f"{current_database}.{current_table}.item") and event not in ('start_map', 'end_map', 'start_array', 'end_array'):
-                    # Accumulate the record
-                    if prefix.endswith('.item'):
-                        database_data[current_table].append(value)
-        
-        # Process last database
-        if current_database and database_data:
-            self.logger.info(f"[{processed_databases+1}/{database_count}] Processing {current_database}")
-            transformed_data = self.transform_database_data(current_database, database_data)
+            # Write transformed data to temporary files immediately
             for table, records in transformed_data.items():
                 if records:
                     if table not in temp_files:
+                        # Create new temp file for this table
                         temp_file = os.path.join(temp_dir, f"{table}.jsonl")
                         temp_files[table] = temp_file
                         tables_with_data.add(table)
                     
-                    with open(temp_files[table], 'a') as tf:
-                        for record in records:
-                            json.dump(record, tf, default=str, ensure_ascii=False)
-                            tf.write('\n')
+                    # Append records to temp file (JSONL format for streaming)
+                    with open(temp_files[table], 'ab') as tf:
+                        for start in range(0, len(records), JSONL_WRITE_BATCH):
+                            tf.write(self._encode_jsonl(records[start:start + JSONL_WRITE_BATCH]))
                     
                     total_records += len(records)
+                    table_record_counts[table] = table_record_counts.get(table, 0) + len(records)
             
             processed_databases += 1
             if tracker:
                 tracker.update_progress(1)
+            
+            self.memory_monitor.log_memory_status(f"After transforming {current_database}")
+        
+        # Databases are independent, so with more than one worker they are transformed in
+        # separate processes while this one keeps parsing; results are written in input order
+        workers = self.config.get('workers', 1)
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_transform_worker, initargs=(self.config,)
+            )
+            self.logger.info(f"Transforming databases with {workers} worker processes")
+        pending = deque()
+        databases_read = 0
+        
+        try:
+            with open_plain_reader(filepath) as f:
+                # Each database object is built by ijson's C backend and handed over as a plain
+                # dict, so only one database is held in memory and no per-field events reach Python
+                for current_database, database_data in ijson.kvitems(f, '', use_float=True):
+                    if current_database == 'extraction_metadata' or current_database.startswith('_'):
+                        continue
+                    if not isinstance(database_data, dict):
+                        continue
+                    
+                    # Tables no mapping reads are released before transforming (or pickling
+                    # them for a worker process) instead of being carried through the database
+                    database_data = {
+                        table: table_info for table, table_info in database_data.items()
+                        if table in self.targets_by_source
+                    }
+                    
+                    databases_read += 1
+                    self.logger.info(f"[{databases_read}/{database_count or '?'}] Processing {current_database}")
+                    
+                    # Check memory
+                    self.memory_monitor.check_memory(f"before transforming {current_database}")
+                    
+                    if executor is None:
+                        # Transform the database data
+                        transformed_data = self.transform_database_data(current_database, database_data)
+                        del database_data
+                        write_transformed(current_database, transformed_data)
+                        
+                        # Free memory immediately
+                        del transformed_data
+                        continue
+                    
+                    pending.append((
+                        current_database,
+                        executor.submit(_transform_database_in_worker, current_database, database_data)
+                    ))
+                    del database_data
+                    
+                    # Bound the number of databases held in memory across the pool
+                    while len(pending) >= workers * 2:
+                        database, future = pending.popleft()
+                        write_transformed(database, future.result())
+            
+            while pending:
+                database, future = pending.popleft()
+                write_transformed(database, future.result())
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
         
         # Now combine temp files into final output file
         self.logger.info("Combining transformed data into final output file...")
         
         # Open output file (compressed or not)
         if use_compression:
-            out_f = gzip.open(output_path, 'wt', encoding='utf-8')
+            out_f = open_gzip_writer(output_path)
         else:
-            out_f = open(output_path, 'w')
+            out_f = open(output_path, 'wb')
         
         try:
+            # Output is staged in a bytearray and written in large blocks, instead of one
+            # write call each for the separator, indent and record of every line
+            staged = bytearray()
+            
             # Write header
-            out_f.write('{\n')
-            out_f.write(f'  "etl_timestamp": "{datetime.now().isoformat()}",\n')
-            out_f.write('  "tables": {\n')
+            staged += b'{\n'
+            staged += f'  "etl_timestamp": "{run_time.isoformat()}",\n'.encode('utf-8')
+            staged += b'  "tables": {\n'
             
             # Write each table's data from temp files
             table_count = 0
             for table in sorted(tables_with_data):
                 if table_count > 0:
-                    out_f.write(',\n')
+                    staged += b',\n'
                 
-                out_f.write(f'    "{table}": [\n')
+                staged += f'    "{table}": [\n'.encode('utf-8')
                 
                 # Read from temp file and write to output
                 temp_file = temp_files[table]
-                first_record = True
+                separator = b'      '
                 
-                with open(temp_file, 'r') as tf:
+                with open(temp_file, 'rb') as tf:
                     for line in tf:
-                        if line.strip():
-                            if not first_record:
-                                out_f.write(',\n')
-                            out_f.write('      ')
-                            out_f.write(line.strip())
-                            first_record = False
+                        line = line.strip()
+                        if line:
+                            staged += separator
+                            staged += line
+                            separator = b',\n      '
+                            if len(staged) >= OUTPUT_STAGING_SIZE:
+                                out_f.write(staged)
+                                # A new buffer, so a writer still holding the old one is unaffected
+                                staged = bytearray()
                 
-                out_f.write('\n    ]')
+                staged += b'\n    ]'
                 table_count += 1
                 
                 # Delete temp file immediately to free disk space
                 os.remove(temp_file)
             
-            out_f.write('\n  }\n}')
+            staged += b'\n  }\n}'
+            out_f.write(staged)
         finally:
             out_f.close()
             
@@ -803,16 +1134,20 @@ class DataTransformer:
         except:
             pass
         
+        self._write_metadata_sidecar(output_path, table_record_counts)
+        
         self.logger.info(f"Transformation complete: {total_records} records in {table_count} tables")
         self.logger.info(f"Output file: {output_path}")
         
         return output_path
     
+    @relax_gc_for_bulk_processing()
     def _transform_file_streaming_fallback(self, filepath: str, etl_id: Optional[str] = None) -> str:
         """
         Fallback streaming method when ijson is not available
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        run_time = datetime.now()
+        timestamp = run_time.strftime("%Y%m%d_%H%M%S")
         
         # Create ETL-specific directory if etl_id is provided
         if etl_id:
@@ -824,76 +1159,19 @@ class DataTransformer:
         output_filename = f"snowflake_data_{timestamp}.json"
         output_path = os.path.join(output_dir, output_filename)
         
-        # First, extract just the structure to understand the file
-        self.logger.info("Analyzing file structure (using fallback method)...")
-        databases = []
-        with open(filepath, 'r') as f:
-            # Read first character to check if it's a JSON object
-            first_char = f.read(1)
-            if first_char != '{':
-                raise ValueError("Expected JSON object")
-            
-            # Simple parser to extract top-level keys (database names)
-            current_key = ""
-            in_string = False
-            escape_next = False
-            depth = 1
-            
-            while depth > 0:
-                char = f.read(1)
-                if not char:
-                    break
-                    
-                if escape_next:
-                    escape_next = False
-                    if in_string:
-                        current_key += char
-                    continue
-                    
-                if char == '\\':
-                    escape_next = True
-                    if in_string:
-                        current_key += char
-                    continue
-                    
-                if char == '"' and not escape_next:
-                    if not in_string:
-                        in_string = True
-                        current_key = ""
-                    else:
-                        in_string = False
-                        if depth == 1 and current_key and current_key != "extraction_metadata":
-                            databases.append(current_key)
-                    continue
-                    
-                if in_string:
-                    current_key += char
-                else:
-                    if char == '{':
-                        depth += 1
-                    elif char == '}':
-                        depth -= 1
-        
-        self.logger.info(f"Found {len(databases)} databases to transform")
-        
-        # Initialize output file with proper structure
-        with open(output_path, 'w') as out_f:
-            out_f.write('{\n')
-            out_f.write(f'  "etl_timestamp": "{datetime.now().isoformat()}",\n')
-            out_f.write('  "tables": {\n')
-        
-        # Track all transformed tables
-        all_tables_data = {table: [] for table in self.target_tables}
+        # Each database's records are appended to per-table temp files as soon as it is
+        # transformed, so only one database's records are held in memory at a time
+        temp_dir = tempfile.mkdtemp(prefix='etl_transform_')
+        temp_files = {}
+        table_record_counts = dict.fromkeys(self.target_tables, 0)
         total_processed = 0
         
-        # Process each database one at a time
-        for idx, database in enumerate(databases):
-            self.logger.info(f"Processing database {idx+1}/{len(databases)}: {database}")
+        # Process each database as the single scan of the file reaches it
+        self.logger.info("Scanning file for databases (using fallback method)...")
+        for idx, (database, database_data) in enumerate(self._iter_databases_from_file(filepath)):
+            self.logger.info(f"Processing database {idx+1}: {database}")
             
             try:
-                # Extract just this database's data
-                database_data = self._extract_single_database_from_file(filepath, database)
-                
                 if database_data:
                     # Check memory before transformation
                     self.memory_monitor.check_memory(f"before transforming {database}")
@@ -901,9 +1179,16 @@ class DataTransformer:
                     # Transform this database's data
                     transformed_data = self.transform_database_data(database, database_data)
                     
-                    # Accumulate results
+                    # Sanitize and spool results (JSONL, one record per line)
                     for table, records in transformed_data.items():
-                        all_tables_data[table].extend(records)
+                        if records:
+                            temp_file = temp_files.setdefault(table, os.path.join(temp_dir, f"{table}.jsonl"))
+                            with open(temp_file, 'ab') as tf:
+                                for start in range(0, len(records), JSONL_WRITE_BATCH):
+                                    tf.write(self._encode_jsonl(
+                                        self.sanitize_records(records[start:start + JSONL_WRITE_BATCH])
+                                    ))
+                            table_record_counts[table] += len(records)
                     
                     # Log progress
                     db_records = sum(len(records) for records in transformed_data.values())
@@ -913,7 +1198,6 @@ class DataTransformer:
                     # Clear memory
                     del database_data
                     del transformed_data
-                    gc.collect()
                     
                     # Log memory status
                     self.memory_monitor.log_memory_status(f"After transforming {database}")
@@ -921,117 +1205,124 @@ class DataTransformer:
             except Exception as e:
                 self.logger.error(f"Error processing database {database}: {e}")
         
-        # Write all transformed data to output file
-        with open(output_path, 'a') as out_f:
-            table_count = 0
-            total_tables = len(all_tables_data)
+        # Write the spooled records to the output file, one table at a time
+        with open(output_path, 'wb', buffering=OUTPUT_WRITE_BUFFER_SIZE) as out_f:
+            out_f.write(b'{\n')
+            out_f.write(f'  "etl_timestamp": "{run_time.isoformat()}",\n'.encode())
+            out_f.write(b'  "tables": {\n')
             
-            for table_name, records in all_tables_data.items():
+            for table_count, table_name in enumerate(table_record_counts):
                 if table_count > 0:
-                    out_f.write(',\n')
+                    out_f.write(b',\n')
                 
-                out_f.write(f'    "{table_name}": ')
+                out_f.write(f'    "{table_name}": '.encode())
                 
-                # Sanitize and write records
-                if records:
-                    sanitized_records = self.sanitize_records(records)
-                    json.dump(sanitized_records, out_f, default=str, ensure_ascii=False, separators=(',', ':'))
-                    self.logger.info(f"  Written {table_name}: {len(sanitized_records)} records")
+                temp_file = temp_files.get(table_name)
+                if temp_file:
+                    separator = b'['
+                    with open(temp_file, 'rb') as tf:
+                        for line in tf:
+                            out_f.write(separator)
+                            out_f.write(line.rstrip(b'\n'))
+                            separator = b','
+                    out_f.write(b']')
+                    self.logger.info(f"  Written {table_name}: {table_record_counts[table_name]} records")
+                    
+                    # Delete temp file immediately to free disk space
+                    os.remove(temp_file)
                 else:
-                    out_f.write('[]')
+                    out_f.write(b'[]')
                 
-                table_count += 1
+            out_f.write(b'\n  }\n}')
                 
-                # Clear memory after writing large tables
-                if len(records) > 10000:
-                    all_tables_data[table_name] = None
-                    gc.collect()
+        # Clean up temp directory
+        try:
+            os.rmdir(temp_dir)
+        except OSError:
+            pass
             
-            out_f.write('\n  }\n}')
+        self._write_metadata_sidecar(output_path, table_record_counts)
         
         self.logger.info(f"Streaming transformation complete: {total_processed} total records")
         return output_path
     
-    def _extract_single_database_from_file(self, filepath: str, target_database: str) -> Dict:
+    def _iter_databases_from_file(self, filepath: str) -> Iterator[Tuple[str, Dict]]:
         """
-        Extract a single database's data from a large JSON file without loading the entire file
+        Yield each top-level database object of a large JSON file in a single pass
+        
+        The file is read in chunks and only quotes, backslashes and braces are
+        inspected, so every database is captured as the scan passes it instead of
+        re-reading the file from the start for each one.
         
         Args:
             filepath: Path to the JSON file
-            target_database: Name of the database to extract
             
-        Returns:
-            Dictionary containing the database's data
+        Yields:
+            Tuples of (database name, database data); data is empty if it failed to parse
         """
         with open(filepath, 'r') as f:
-            # Use a simple state machine to find and extract the target database
-            current_key = ""
+            depth = 0
             in_string = False
-            escape_next = False
-            found_database = False
-            brace_count = 0
-            capture_data = False
-            json_buffer = ""
+            skip_pos = -1  # Position of a character escaped by a backslash
+            key_parts = []  # Raw text of the top-level key being read
+            current_key = None
+            capture_parts = []  # Raw text of the database object being captured
             
             while True:
-                char = f.read(1)
-                if not char:
+                chunk = f.read(FALLBACK_SCAN_CHUNK_SIZE)
+                if not chunk:
                     break
                 
-                if escape_next:
-                    escape_next = False
-                    if capture_data:
-                        json_buffer += char
-                    continue
-                
-                if char == '\\':
-                    escape_next = True
-                    if capture_data:
-                        json_buffer += char
-                    continue
-                
-                if char == '"' and not escape_next:
-                    in_string = not in_string
-                    if capture_data:
-                        json_buffer += char
-                    elif not in_string and current_key == target_database and not found_database:
-                        # We found our target database
-                        found_database = True
-                        # Skip until we find the opening brace
-                        while True:
-                            char = f.read(1)
-                            if char == '{':
-                                capture_data = True
-                                json_buffer = '{'
-                                brace_count = 1
-                                break
-                    if in_string and not capture_data:
-                        current_key = ""
-                    continue
+                key_start = 0
+                capture_start = 0
+                for match in _JSON_STRUCTURE_CHARS.finditer(chunk):
+                    pos = match.start()
+                    if pos == skip_pos:
+                        continue
+                    char = match.group()
                 
-                if in_string and not capture_data:
-                    current_key += char
-                elif capture_data:
-                    json_buffer += char
-                    if not in_string:
-                        if char == '{':
-                            brace_count += 1
-                        elif char == '}':
-                            brace_count -= 1
-                            if brace_count == 0:
-                                # We've captured the entire database object
+                    if in_string:
+                        if char == '\\':
+                            skip_pos = pos + 1
+                        elif char == '"':
+                            in_string = False
+                            if depth == 1:
+                                key_parts.append(chunk[key_start:pos])
+                                current_key = json.loads('"' + ''.join(key_parts) + '"')
+                                key_parts = []
+                    elif char == '"':
+                        in_string = True
+                        if depth == 1:
+                            key_start = pos + 1
+                    elif char == '{':
+                        depth += 1
+                        if depth == 2:
+                            capture_start = pos
+                    elif char == '}':
+                        if depth == 2:
+                            capture_parts.append(chunk[capture_start:pos + 1])
+                            database = current_key
+                            database_json = ''.join(capture_parts)
+                            capture_parts = []
+                            if database != 'extraction_metadata':
                                 try:
-                                    return json.loads(json_buffer)
+                                    database_data = json.loads(database_json)
                                 except json.JSONDecodeError as e:
-                                    self.logger.error(f"Failed to parse database {target_database}: {e}")
-                                    return {}
-        
-        return {}
+                                    self.logger.error(f"Failed to parse database {database}: {e}")
+                                    database_data = {}
+                                yield database, database_data
+                        depth -= 1
+                
+                # Carry partially read text over to the next chunk
+                skip_pos = 0 if skip_pos == len(chunk) else -1
+                if in_string and depth == 1:
+                    key_parts.append(chunk[key_start:])
+                if depth >= 2:
+                    capture_parts.append(chunk[capture_start:])
     
     def get_transformation_stats(self, transformed_file: str) -> Dict:
         """Get statistics about transformed data"""
-        with open(transformed_file, 'r') as f:
-            data = json.load(f)
+        data = self._load_json_file(transformed_file)
         
         tables = data.get('tables', {})
         
@@ -1044,6 +1335,39 @@ class DataTransformer:
         return stats
 
 
+# Transformer of a worker process in the streaming transformer's process pool
+_worker_transformer = None
+
+# Log format of worker processes (matches the pipeline's handlers)
+WORKER_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(funcName)s:%(lineno)d] - %(message)s'
+
+
+def _init_transform_worker(config: Dict):
+    """Create the transformer used by this worker process"""
+    global _worker_transformer
+    
+    # A forked worker inherits the pipeline's QueueHandler, but the listener thread reading
+    # that queue only runs in the parent: log to stderr directly instead
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(WORKER_LOG_FORMAT))
+    root_logger.addHandler(handler)
+    
+    _worker_transformer = DataTransformer(config)
+
+
+def _transform_database_in_worker(database: str, database_data: Dict) -> Dict[str, List[Dict]]:
+    """Transform one database in a worker process"""
+    return _worker_transformer.transform_database_data(database, database_data)
+
+
+def _transform_file_in_worker(filepath: str) -> Dict[str, List[Dict]]:
+    """Transform one extracted file in a worker process"""
+    return _worker_transformer._process_file_for_parallel(filepath)
+
+
 if __name__ == "__main__":
     # Example usage
     transformer = DataTransformer()